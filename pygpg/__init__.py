@@ -0,0 +1,4 @@
+"""A thin wrapper around GPG with friendlier command line options!"""
+from pygpg.keyring import Keyring
+
+__all__ = ["Keyring"]
@@ -0,0 +1,197 @@
+"""This module contains the code for the encrypt, decrypt and sign commands."""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+
+import click
+
+from pygpg.exceptions import LockTimeoutError, RecipientError, StreamOperationError
+from pygpg.gnupg_extension.crypt import decrypt_stream, encrypt_stream, sign_stream
+from pygpg.gnupg_extension.stream import StreamResult
+from pygpg.utils.files import atomic_write
+from pygpg.utils.fleet import FLEET_META_KEY, Fleet
+from pygpg.utils.keys import resolve_recipients
+from pygpg.utils.lock import LOCK_META_KEY
+from pygpg.utils.timings import TIMINGS_META_KEY, Timer, format_size, report_throughput
+
+if TYPE_CHECKING:
+    import gnupg
+
+INPUT_FILE = click.Path(exists=True, dir_okay=False, allow_dash=True)
+OUTPUT_FILE = click.Path(exists=False, dir_okay=False, allow_dash=True)
+
+
+@click.command()
+@click.argument("file", type=INPUT_FILE, default="-")
+@click.option(
+    "-r",
+    "--recipient",
+    multiple=True,
+    required=True,
+    help="Email, key ID or fingerprint of a key to encrypt for. Can be given multiple times",
+)
+@click.option("-a", "--armor", is_flag=True, help="Produce ASCII armored output instead of binary output")
+@click.option("-o", "--output", type=OUTPUT_FILE, default="-", help="Save the encrypted data to this file")
+@click.pass_context
+def encrypt(ctx, file: str, recipient: Tuple[str], armor: bool, output: str):
+    """Encrypt a file for one or many recipients.
+
+    FILE is the file to encrypt. When it is omitted or is `-`, the data is read from standard input.
+    The data is streamed through GPG, so files of any size can be encrypted.
+    """
+    try:
+        with ctx.meta[LOCK_META_KEY].shared():
+            recipients = resolve_recipients(ctx.obj, recipient)
+    except (RecipientError, LockTimeoutError) as ex:
+        click.secho(str(ex), fg="red", err=True)
+        sys.exit(1)
+
+    run_stream_operation(ctx, "Encrypted", file, output, encrypt_stream, recipients, armor)
+
+
+@click.command("encrypt-tree")
+@click.argument("src", type=click.Path(exists=True, file_okay=False))
+@click.argument("dst", type=click.Path(file_okay=False))
+@click.option(
+    "-r",
+    "--recipient",
+    multiple=True,
+    required=True,
+    help="Email, key ID or fingerprint of a key to encrypt for. Can be given multiple times",
+)
+@click.option("-a", "--armor", is_flag=True, help="Produce ASCII armored output instead of binary output")
+@click.pass_context
+def encrypt_tree(ctx, src: str, dst: str, recipient: Tuple[str], armor: bool):  # pylint: disable=R0914
+    """Encrypt all the files in a directory tree for one or many recipients.
+
+    The encrypted files are written to DST, mirroring the structure of SRC, with a `.gpg`
+    extension (or `.asc` when using --armor). Files are encrypted concurrently, and files
+    whose encrypted version is newer than the original are skipped, so running the command
+    again only encrypts what changed. When DST is inside SRC, the files in DST are not encrypted.
+    """
+    try:
+        with ctx.meta[LOCK_META_KEY].shared():
+            recipients = resolve_recipients(ctx.obj, recipient)
+    except (RecipientError, LockTimeoutError) as ex:
+        click.secho(str(ex), fg="red", err=True)
+        sys.exit(1)
+
+    src_path, dst_path = Path(src), Path(dst)
+    extension = ".asc" if armor else ".gpg"
+    to_encrypt: List[Tuple[Path, Path]] = []
+    skipped = 0
+    resolved_dst = dst_path.resolve()
+    for file in sorted(path for path in src_path.rglob("*") if path.is_file()):
+        if resolved_dst in file.resolve().parents:
+            continue
+
+        encrypted_file = dst_path / file.relative_to(src_path).with_name(file.name + extension)
+        if encrypted_file.exists() and encrypted_file.stat().st_mtime >= file.stat().st_mtime:
+            skipped += 1
+        else:
+            to_encrypt.append((file, encrypted_file))
+
+    fleet: Fleet = ctx.meta[FLEET_META_KEY]
+    total_bytes = sum(file.stat().st_size for file, _encrypted_file in to_encrypt)
+    errors = []
+
+    with Timer() as timer, ThreadPoolExecutor(max_workers=fleet.max_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(encrypt_file, ctx.obj, file, encrypted_file, recipients, armor): file
+            for file, encrypted_file in to_encrypt
+        }
+        with click.progressbar(length=total_bytes, label="Encrypting", file=sys.stderr) as progress:
+            for future in as_completed(futures):
+                try:
+                    progress.update(future.result())
+                except (OSError, StreamOperationError) as ex:
+                    errors.append(f"{futures[future]}: {ex}")
+
+    click.secho(
+        f"Encrypted {len(to_encrypt) - len(errors)} files ({format_size(total_bytes)}), "
+        f"skipped {skipped} up to date files",
+        fg="green",
+        err=True,
+    )
+    report_throughput("Encrypted", total_bytes, timer.elapsed)
+
+    if errors:
+        for error in errors:
+            click.secho(error, fg="red", err=True)
+        sys.exit(1)
+
+
+def encrypt_file(gpg: "gnupg.GPG", file: Path, encrypted_file: Path, recipients: List[str], armor: bool) -> int:
+    """Encrypt a file, creating the parent directories of the encrypted file as needed.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param file: The file to encrypt
+    :param encrypted_file: The path where the encrypted file is written (atomically)
+    :param recipients: The key IDs or fingerprints of the keys for which to encrypt the file
+    :param armor: Whether to produce ASCII armored output instead of binary output
+    :return: The size of the file that was encrypted
+    """
+    encrypted_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(file, "rb") as source, atomic_write(encrypted_file) as sink:
+        return encrypt_stream(gpg, source, sink, recipients, armor).bytes_read
+
+
+@click.command()
+@click.argument("file", type=INPUT_FILE, default="-")
+@click.option("-o", "--output", type=OUTPUT_FILE, default="-", help="Save the decrypted data to this file")
+@click.pass_context
+def decrypt(ctx, file: str, output: str):
+    """Decrypt a file.
+
+    FILE is the file to decrypt. When it is omitted or is `-`, the data is read from standard input.
+    The data is streamed through GPG, so files of any size can be decrypted.
+    """
+    run_stream_operation(ctx, "Decrypted", file, output, decrypt_stream)
+
+
+@click.command()
+@click.argument("file", type=INPUT_FILE, default="-")
+@click.option("-u", "--local-user", help="The ID of the key to sign with (defaults to GPG's default key)")
+@click.option("-d", "--detach", is_flag=True, help="Only output a detached signature instead of the signed data")
+@click.option("-a", "--armor", is_flag=True, help="Produce ASCII armored output instead of binary output")
+@click.option("-o", "--output", type=OUTPUT_FILE, default="-", help="Save the signed data or signature to this file")
+@click.pass_context
+def sign(ctx, file: str, local_user: Optional[str], detach: bool, armor: bool, output: str):  # pylint: disable=R0913
+    """Sign a file.
+
+    FILE is the file to sign. When it is omitted or is `-`, the data is read from standard input.
+    The data is streamed through GPG, so files of any size can be signed.
+    """
+    run_stream_operation(ctx, "Signed", file, output, sign_stream, local_user, detach, armor)
+
+
+def run_stream_operation(
+    ctx, operation: str, file: str, output: str, stream_func: Callable[..., StreamResult], *args: Any
+):
+    """Stream a file through a GPG operation and report errors and timings.
+
+    :param ctx: The click context
+    :param operation: The past tense name of the operation, used to report timings (e.g. "Encrypted")
+    :param file: The path of the input file, or `-` for standard input
+    :param output: The path of the output file, or `-` for standard output
+    :param stream_func: The function which streams the data through GPG
+    :param args: Extra arguments to give to the stream function
+    """
+    if output != "-" and Path(output).exists():
+        click.secho("A file already exists at this path, aborting to avoid overwriting", fg="red", err=True)
+        sys.exit(1)
+
+    try:
+        with click.open_file(file, "rb") as source, click.open_file(output, "wb") as sink, Timer() as timer:
+            result = stream_func(ctx.obj, source, sink, *args)
+    except (OSError, StreamOperationError) as ex:
+        if output != "-" and Path(output).exists():
+            Path(output).unlink()
+
+        click.secho(str(ex), fg="red", err=True)
+        sys.exit(1)
+
+    if ctx.meta.get(TIMINGS_META_KEY):
+        report_throughput(operation, result.bytes_read, timer.elapsed)
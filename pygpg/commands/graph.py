@@ -0,0 +1,131 @@
+"""This module contains the code for the graph commands."""
+import sys
+from typing import TYPE_CHECKING, Optional
+
+import click
+
+from pygpg.exceptions import LockTimeoutError
+from pygpg.gnupg_extension.list_sigs import list_signatures
+from pygpg.signature_graph import SignatureGraph
+from pygpg.utils.cache import get_gpg_keyring_files, get_keyring_mtime, load_cache, save_cache
+from pygpg.utils.lock import LOCK_META_KEY
+from pygpg.utils.timings import TIMINGS_META_KEY, Timer, report_duration
+
+if TYPE_CHECKING:
+    import gnupg
+
+SIGNATURE_GRAPH_CACHE = "signature-graph.json"
+
+
+@click.group()
+def graph():
+    """Explore the certifications between the keys in the keyring (the web of trust).
+
+    The signatures in the keyring are read once and cached until the keyring changes, so that
+    queries stay fast on large keyrings. Keys can be given by ID, fingerprint or email.
+    """
+
+
+@graph.command()
+@click.argument("source")
+@click.argument("target")
+@click.pass_context
+def path(ctx, source: str, target: str):
+    """Show the shortest chain of certifications from SOURCE to TARGET.
+
+    Each key in the chain has certified a user ID of the next key.
+    """
+    signature_graph = get_signature_graph(ctx)
+    source_id = resolve_key_id(signature_graph, source)
+    target_id = resolve_key_id(signature_graph, target)
+
+    with Timer() as timer:
+        key_ids = signature_graph.shortest_path(source_id, target_id)
+
+    if ctx.meta.get(TIMINGS_META_KEY):
+        report_duration("Path search", timer.elapsed)
+
+    if key_ids is None:
+        click.secho(f"There is no chain of certifications from {source} to {target}", fg="red")
+        sys.exit(1)
+
+    for depth, key_id in enumerate(key_ids):
+        display_graph_key(signature_graph, key_id, depth)
+
+
+@graph.command()
+@click.argument("source")
+@click.option("-d", "--max-depth", type=click.IntRange(min=1), help="Maximum length of the chains of certifications")
+@click.pass_context
+def reachable(ctx, source: str, max_depth: Optional[int]):
+    """Show all the keys that can be reached from SOURCE through chains of certifications.
+
+    Keys are shown with the length of the shortest chain that reaches them.
+    """
+    signature_graph = get_signature_graph(ctx)
+    source_id = resolve_key_id(signature_graph, source)
+
+    with Timer() as timer:
+        depths = signature_graph.reachable(source_id, max_depth)
+
+    if ctx.meta.get(TIMINGS_META_KEY):
+        report_duration("Reachable set search", timer.elapsed)
+
+    for key_id, depth in sorted(depths.items(), key=lambda item: (item[1], item[0])):
+        display_graph_key(signature_graph, key_id, depth)
+
+    click.secho(f"{len(depths)} reachable keys", bold=True)
+
+
+def get_signature_graph(ctx) -> SignatureGraph:
+    """Get the graph of the certifications in the keyring, from the cache if the keyring did not change.
+
+    :param ctx: The click context
+    :return: The graph of the certifications in the keyring
+    """
+    gpg: "gnupg.GPG" = ctx.obj
+    with Timer() as timer:
+        cached_graph = load_cache(gpg, SIGNATURE_GRAPH_CACHE)
+        if cached_graph is not None:
+            signature_graph = SignatureGraph.from_dict(cached_graph)
+        else:
+            try:
+                with ctx.meta[LOCK_META_KEY].shared():
+                    keyring_mtime = get_keyring_mtime(get_gpg_keyring_files(gpg))
+                    signature_graph = SignatureGraph.from_colon_records(list_signatures(gpg))
+            except LockTimeoutError as ex:
+                click.secho(str(ex), fg="red")
+                sys.exit(1)
+
+            save_cache(gpg, SIGNATURE_GRAPH_CACHE, signature_graph.to_dict(), keyring_mtime)
+
+    if ctx.meta.get(TIMINGS_META_KEY):
+        report_duration("Cached graph load" if cached_graph is not None else "Graph build", timer.elapsed)
+
+    return signature_graph
+
+
+def resolve_key_id(signature_graph: SignatureGraph, identifier: str) -> str:
+    """Find the key ID of a key given by the user, or exit if it is not in the graph.
+
+    :param signature_graph: The graph of the certifications in the keyring
+    :param identifier: The fingerprint, key ID or email given by the user
+    :return: The long key ID of the key
+    """
+    key_id = signature_graph.resolve(identifier)
+    if key_id is None:
+        click.secho(f"The key {identifier} is not in the keyring", fg="red")
+        sys.exit(1)
+
+    return key_id
+
+
+def display_graph_key(signature_graph: SignatureGraph, key_id: str, depth: int):
+    """Display a key of the graph on the terminal, on one line.
+
+    :param signature_graph: The graph of the certifications in the keyring
+    :param key_id: The long ID of the key to display
+    :param depth: The length of the chain of certifications leading to the key
+    """
+    name = signature_graph.names.get(key_id, "")
+    click.echo(f"{depth:>3} {click.style(key_id, fg='cyan')} {click.style(name, fg='bright_black')}")
@@ -1,33 +1,96 @@
 """This module contains the code for the import and export commands."""
+import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, BinaryIO, List, Optional, Tuple
 
 import click
-import gnupg
 
+from pygpg.exceptions import KeyExportError, LockTimeoutError
 from pygpg.gnupg_extension.export_key import export_private_key, export_public_key, export_secret_subkeys
+from pygpg.gnupg_extension.import_key import import_key_batches
+from pygpg.utils.completion import make_key_completion
+from pygpg.utils.files import parse_size, write_if_changed
+from pygpg.utils.fleet import FLEET_META_KEY, Fleet
+from pygpg.utils.keys import build_key_index, get_private_keys, get_public_keys
+from pygpg.utils.lock import LOCK_META_KEY, HomeLock
+from pygpg.utils.timings import format_size
+
+if TYPE_CHECKING:
+    import gnupg
+
+DEFAULT_MAX_BATCH_SIZE = "16M"
+
+
+def validate_size(_ctx, _param, value: str) -> int:
+    """Validate a size supplied by the user.
+
+    :param _ctx: The click context
+    :param _param: The parameter that is being validated
+    :param value: The value that was provided by the user
+    :return: The size, in bytes
+    """
+    try:
+        size = parse_size(value)
+    except ValueError as ex:
+        raise click.BadParameter("must be a number of bytes, optionally followed by K, M or G") from ex
+
+    if size <= 0:
+        raise click.BadParameter("must be greater than zero")
+
+    return size
 
 
 @click.command("import")
-@click.argument("file", type=click.Path(exists=True, readable=True, resolve_path=True))
-@click.pass_obj
-def import_key(gpg: gnupg.GPG, file: str):
+@click.argument("file", type=click.Path(exists=True, readable=True, resolve_path=True, allow_dash=True))
+@click.option(
+    "-m",
+    "--max-batch-size",
+    default=DEFAULT_MAX_BATCH_SIZE,
+    show_default=True,
+    callback=validate_size,
+    help="Maximum amount of key data to hold in memory and send to GPG at once (e.g. 512K, 64M)",
+)
+@click.pass_context
+def import_key(ctx, file: str, max_batch_size: int):
     """Import one or many GPG keys.
 
     FILE can be an archive, directory, or individual key file.
     If FILE is a directory or an archive, all keys contained within
     will be imported. In the case of an archive, the keys must be
     at the top level of the archive (not in a directory in the archive).
+
+    When FILE is `-`, keys are read from standard input. Key files are
+    read progressively and imported in batches, so key dumps of any size
+    can be imported with a bounded amount of memory. Imports which run at the same
+    time as other pygpg imports in the same GPG home are coalesced into a single
+    invocation of GPG.
     """
+    lock: HomeLock = ctx.meta[LOCK_META_KEY]
+    if file == "-":
+        try:
+            imported_keys = import_key_stream(ctx.obj, click.get_binary_stream("stdin"), max_batch_size, True, lock)
+        except ValueError as ex:
+            click.secho(f"No keys could be imported from standard input: {ex}", fg="red")
+            sys.exit(1)
+
+        click.secho(f"Imported {imported_keys} key{'s' if imported_keys > 1 or imported_keys == 0 else ''}", fg="green")
+        return
+
     path = Path(file)
     if path.is_dir():
-        import_keys_in_dir(gpg, path)
+        import_keys_in_dir(ctx.obj, path, max_batch_size, lock)
         return
 
-    imported_keys = import_key_from_file(gpg, path)
+    parse_error: Optional[ValueError] = None
+    try:
+        imported_keys = import_key_from_file(ctx.obj, path, max_batch_size, lock)
+    except ValueError as ex:
+        parse_error, imported_keys = ex, 0
+
     if imported_keys:
         click.secho(f"Imported {imported_keys} key{'s' if imported_keys > 1 or imported_keys == 0 else ''}", fg="green")
         return
@@ -35,48 +98,86 @@ def import_key(gpg: gnupg.GPG, file: str):
     with TemporaryDirectory() as temp_dir:
         try:
             shutil.unpack_archive(path, temp_dir)
-            import_keys_in_dir(gpg, Path(temp_dir))
-        except ValueError:
-            click.secho("The archive extension is not known, keys cannot be extracted", fg="red")
+            import_keys_in_dir(ctx.obj, Path(temp_dir), max_batch_size, lock)
+        except (ValueError, shutil.ReadError):
+            if parse_error is not None:
+                click.secho(f"No keys could be imported from {file}: {parse_error}", fg="red")
+            else:
+                click.secho("The archive extension is not known, keys cannot be extracted", fg="red")
+            sys.exit(1)
 
 
-def import_keys_in_dir(gpg: gnupg.GPG, dir_path: Path):
+def import_keys_in_dir(gpg: "gnupg.GPG", dir_path: Path, max_batch_size: int, lock: Optional[HomeLock] = None):
     """Import all the GPG keys in a directory.
 
     :param gpg: The GPG interface used by the gnupg library
     :param dir_path: The path to the directory from which to import keys
+    :param max_batch_size: The maximum amount of key data to send to GPG at once, in bytes
+    :param lock: The lock on the GPG home, to coalesce the import with those of other processes
     """
     files = [file for file in dir_path.glob("*") if file.is_file()]
 
     total_count = 0
     for file in files:
-        total_count += import_key_from_file(gpg, file)
+        try:
+            total_count += import_key_from_file(gpg, file, max_batch_size, lock)
+        except ValueError as ex:
+            click.secho(f"No keys could be imported from {file.name}: {ex}", fg="yellow", err=True)
 
     click.secho(f"Imported {total_count} key{'s' if total_count > 1 or total_count == 0 else ''}", fg="green")
 
 
-def import_key_from_file(gpg: gnupg.GPG, file: Path) -> int:
+def import_key_from_file(gpg: "gnupg.GPG", file: Path, max_batch_size: int, lock: Optional[HomeLock] = None) -> int:
     """Import GPG keys from a file.
 
     :param gpg: The GPG interface used by the gnupg library
     :param file: The file from which to import keys
-    :return:
+    :param max_batch_size: The maximum amount of key data to send to GPG at once, in bytes
+    :param lock: The lock on the GPG home, to coalesce the import with those of other processes
+    :return: The amount of imported keys
     """
-    with open(file, "r") as open_file:
-        result = 0
-        try:
-            result = gpg.import_keys(open_file.read(), extra_args=["--import-options", "restore"]).count
-        except UnicodeDecodeError:
-            pass
+    with open(file, "rb") as open_file:
+        progress = file.stat().st_size > max_batch_size
+        return import_key_stream(gpg, open_file, max_batch_size, progress, lock)
+
 
-        return result
+def import_key_stream(
+    gpg: "gnupg.GPG", stream: BinaryIO, max_batch_size: int, progress: bool = False, lock: Optional[HomeLock] = None
+) -> int:
+    """Import GPG keys from a binary stream, in batches of bounded size.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param stream: The binary stream from which to import keys
+    :param max_batch_size: The maximum amount of key data to send to GPG at once, in bytes
+    :param progress: Whether to display running counts on stderr after each batch
+    :param lock: The lock on the GPG home, to coalesce the import with those of other processes
+    :return: The amount of imported keys
+    :raises ValueError: If the stream does not start with valid keys
+    """
+    imported_count = 0
+    bytes_read = 0
+    try:
+        for imported_count, bytes_read in import_key_batches(gpg, stream, max_batch_size, lock):
+            if progress:
+                message = f"Imported {imported_count} keys so far ({format_size(bytes_read)} read)"
+                click.secho(message, fg="bright_black", err=True)
+    except ValueError as ex:
+        if not bytes_read:
+            raise
+
+        click.secho(f"Stopped importing keys after {format_size(bytes_read)}: {ex}", fg="yellow", err=True)
+    except LockTimeoutError as ex:
+        click.secho(str(ex), fg="red")
+        sys.exit(1)
+
+    return imported_count
 
 
 @click.command("export-subkeys")
-@click.argument("key_id", nargs=-1)
+@click.argument("key_id", nargs=-1, shell_complete=make_key_completion(private=True))
 @click.option("-o", "--output", type=click.Path(exists=False), help="Save the exported subkeys to this file")
-@click.pass_obj
-def export_subkeys(gpg: gnupg.GPG, output: Optional[str], key_id: Tuple[str]):
+@click.pass_context
+def export_subkeys(ctx, output: Optional[str], key_id: Tuple[str]):
     """Export the private subkeys of one or many primary keys.
 
     KEY_ID is the ID of the primary key for which to export the secret subkeys.
@@ -97,9 +198,14 @@ def export_subkeys(gpg: gnupg.GPG, output: Optional[str], key_id: Tuple[str]):
         sys.exit(1)
 
     all_output = []
-    for key in key_id:
-        private_key, _err = export_secret_subkeys(gpg, key)
-        all_output.append(private_key)
+    try:
+        with ctx.meta[LOCK_META_KEY].shared():
+            for key in key_id:
+                private_key, _err = export_secret_subkeys(ctx.obj, key)
+                all_output.append(private_key)
+    except LockTimeoutError as ex:
+        click.secho(str(ex), fg="red")
+        sys.exit(1)
 
     if output:
         with open(output, "w") as file:
@@ -109,30 +215,167 @@ def export_subkeys(gpg: gnupg.GPG, output: Optional[str], key_id: Tuple[str]):
 
 
 @click.command()
-@click.argument("key_id", nargs=-1)
+@click.argument("key_id", nargs=-1, shell_complete=make_key_completion())
 @click.option("-p", "--private", is_flag=True, help="Export a private key instead of a public key")
 @click.option("-o", "--output", type=click.Path(exists=False), help="Save the exported keys to this file")
-@click.pass_obj
-def export(gpg: gnupg.GPG, output: Optional[str], private: bool, key_id: Tuple[str]):
+@click.option(
+    "-d",
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Save each exported key to its own <fingerprint>.asc file in this directory",
+)
+@click.pass_context
+def export(ctx, output: Optional[str], output_dir: Optional[str], private: bool, key_id: Tuple[str]):
     """Export one or many GPG keys.
 
     KEY_ID is the ID of the primary key that we want to export.
     You can specify multiple IDs at once.
+
+    When many GPG homes are selected, the keys are exported from every home that contains
+    them, and the output of each home is preceded by a comment line naming the home.
+
+    With --output-dir, all the keys in the keyring are exported when no KEY_ID is given.
+    Keys are exported concurrently, and files which already contain the exported key
+    are left untouched.
     """
     if output and Path(output).exists():
         click.secho("A file already exists at this path, aborting to avoid overwriting", fg="red")
         sys.exit(1)
 
+    fleet: Fleet = ctx.meta[FLEET_META_KEY]
+    if output_dir:
+        if output or fleet.is_multi_home:
+            click.secho("--output-dir cannot be used with --output or with many GPG homes", fg="red")
+            sys.exit(1)
+
+        try:
+            with ctx.meta[LOCK_META_KEY].shared():
+                export_keys_to_dir(ctx.obj, Path(output_dir), key_id, private, fleet.max_workers)
+        except LockTimeoutError as ex:
+            click.secho(str(ex), fg="red")
+            sys.exit(1)
+        return
+
+    if fleet.is_multi_home:
+        all_output = []
+        for result in fleet.run(export_keys, key_id, private):
+            if result.error is not None:
+                click.secho(f"{result.gpg_home}: {result.error}", fg="red", err=True)
+            elif any(result.value or []):
+                all_output.append(f"# GPG home: {result.gpg_home}")
+                all_output.extend(export_output for export_output in result.value or [] if export_output)
+    else:
+        try:
+            with ctx.meta[LOCK_META_KEY].shared():
+                all_output = export_keys(ctx.obj, key_id, private)
+        except LockTimeoutError as ex:
+            click.secho(str(ex), fg="red")
+            sys.exit(1)
+
+    if output:
+        with open(output, "w") as file:
+            file.write("\n".join(all_output))
+    else:
+        click.echo("\n".join(all_output))
+
+
+def export_keys_to_dir(
+    gpg: "gnupg.GPG", output_dir: Path, key_ids: Tuple[str, ...], private: bool, max_workers: Optional[int]
+):  # pylint: disable=R0913
+    """Export keys to a directory, with one `<fingerprint>.asc` file per key.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param output_dir: The directory in which to write the key files
+    :param key_ids: The IDs, fingerprints or emails of the primary keys to export, or an empty tuple to export all keys
+    :param private: Whether to export the private keys instead of the public keys
+    :param max_workers: The maximum number of keys to export concurrently
+    """
+    fingerprints, missing_key_ids = get_export_fingerprints(gpg, key_ids, private)
+    errors = [f"No key was found with the ID: {key_id}" for key_id in missing_key_ids]
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(
+                export_key_to_file, gpg, fingerprint, output_dir / f"{fingerprint}.asc", private
+            ): fingerprint
+            for fingerprint in fingerprints
+        }
+        for future in as_completed(futures):
+            try:
+                written += future.result()
+            except (OSError, KeyExportError) as ex:
+                errors.append(f"{futures[future]}: {ex}")
+                failed += 1
+
+    click.secho(f"Wrote {written} key files, {len(fingerprints) - written - failed} unchanged", fg="green")
+    if errors:
+        for error in errors:
+            click.secho(error, fg="red")
+        sys.exit(1)
+
+
+def get_export_fingerprints(gpg: "gnupg.GPG", key_ids: Tuple[str, ...], private: bool) -> Tuple[List[str], List[str]]:
+    """Get the fingerprints of the keys to export to individual files.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param key_ids: The IDs, fingerprints or emails of the primary keys to export, or an empty tuple to export all keys
+    :param private: Whether to select private keys instead of public keys
+    :return: The sorted fingerprints of the selected keys without duplicates, and the key IDs which matched no key
+    """
+    keys = get_private_keys(gpg) if private else get_public_keys(gpg)
+    missing_key_ids = []
+    if key_ids:
+        key_index = build_key_index(keys)
+        selected_keys = []
+        for key_id in key_ids:
+            if "@" in key_id:
+                email = key_id.lower()
+                matches = [key for key in keys if email in (mail.lower() for mail in key.key_owner.emails)]
+            else:
+                matches = [key_index[key_id.upper()]] if key_id.upper() in key_index else []
+
+            if not matches:
+                missing_key_ids.append(key_id)
+            selected_keys.extend(matches)
+        keys = selected_keys
+
+    return sorted({key.key_fingerprint or key.key_id for key in keys}), missing_key_ids
+
+
+def export_key_to_file(gpg: "gnupg.GPG", key_id: str, path: Path, private: bool) -> bool:
+    """Export a single key to a file, unless the file already contains that exact key.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param key_id: The ID or fingerprint of the primary key to export
+    :param path: The path of the file to write
+    :param private: Whether to export the private key instead of the public key
+    :return: Whether or not the file was written
+    """
+    if private:
+        export_output, _err = export_private_key(gpg, key_id)
+    else:
+        export_output, _err = export_public_key(gpg, key_id)
+
+    return write_if_changed(path, export_output.encode("utf-8"), 0o600 if private else None)
+
+
+def export_keys(gpg: "gnupg.GPG", key_ids: Tuple[str, ...], private: bool) -> List[str]:
+    """Export many GPG keys.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param key_ids: The IDs of the primary keys to export
+    :param private: Whether to export the private keys instead of the public keys
+    :return: The exported key data of each key, in the same order as the key IDs
+    """
     all_output = []
-    for key in key_id:
+    for key in key_ids:
         if private:
             export_output, _err = export_private_key(gpg, key)
         else:
             export_output, _err = export_public_key(gpg, key)
         all_output.append(export_output)
 
-    if output:
-        with open(output, "w") as file:
-            file.write("\n".join(all_output))
-    else:
-        click.echo("\n".join(all_output))
+    return all_output
@@ -0,0 +1,55 @@
+"""This module contains the code for the inspect command."""
+import sys
+from itertools import groupby
+from typing import Dict, Iterable, Iterator
+
+import click
+
+from pygpg.commands.ls import display_owner_keys
+from pygpg.enums.key_type import KeyType
+from pygpg.exceptions import KeyFileError
+from pygpg.gnupg_extension.show_keys import show_keys
+from pygpg.gpg_key import GPGKey
+
+
+@click.command()
+@click.argument("file", type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option("-a", "--all", "all_", is_flag=True, help="List all keys in the file, both public and private")
+@click.option("-p", "--private", is_flag=True, help="List private keys in the file")
+@click.option("-n", "--no-subkeys", is_flag=True, help="Omit subkeys in the list of shown keys")
+@click.pass_obj
+def inspect(gpg, file: str, all_: bool, private: bool, no_subkeys: bool):
+    """Show a list of the GPG keys in a file, without importing them.
+
+    FILE is a key file or a key dump, which can be ASCII armored or binary. When FILE is `-`,
+    the keys are read from standard input. Keys are shown as they are read, so files of any
+    size can be inspected. Like with `ls`, keys with a secret part are only shown with the
+    --private or --all options.
+    """
+    if all_:
+        key_types = {KeyType.PUBLIC_KEY, KeyType.PRIVATE_KEY}
+    elif private:
+        key_types = {KeyType.PRIVATE_KEY}
+    else:
+        key_types = {KeyType.PUBLIC_KEY}
+
+    keys = parse_keys(show_keys(gpg, file))
+    try:
+        for owner, owner_keys in groupby((key for key in keys if key.key_type in key_types), lambda key: key.key_owner):
+            display_owner_keys(owner, owner_keys, no_subkeys)
+    except KeyFileError as ex:
+        click.secho(str(ex), fg="red")
+        sys.exit(1)
+
+
+def parse_keys(key_dicts: Iterable[Dict]) -> Iterator[GPGKey]:
+    """Parse the keys listed by GPG, skipping (with a warning) the keys that cannot be parsed.
+
+    :param key_dicts: The keys, as dicts returned by the gnupg library
+    :return: An iterator over the keys that could be parsed
+    """
+    for key_dict in key_dicts:
+        try:
+            yield GPGKey.from_gpg_key_dict(key_dict)
+        except (ValueError, RuntimeError) as ex:
+            click.secho(f"Skipping the key {key_dict.get('keyid', '')}: {ex}", fg="yellow", err=True)
@@ -1,34 +1,85 @@
 """This module contains the code for the ls command."""
-from typing import Dict, List
+import sys
+from typing import TYPE_CHECKING, Dict, Iterable, List
 
 import click
 
 from pygpg.display.display_key import display_key_oneline, display_subkeys_oneline
 from pygpg.display.display_key_owner import display_key_owner
+from pygpg.exceptions import LockTimeoutError
 from pygpg.gpg_key import GPGKey
 from pygpg.key_owner import KeyOwner
+from pygpg.utils.fleet import FLEET_META_KEY, Fleet
 from pygpg.utils.keys import get_private_keys, get_public_keys
+from pygpg.utils.lock import LOCK_META_KEY
+
+if TYPE_CHECKING:
+    import gnupg
 
 
 @click.command()
 @click.option("-a", "--all", "all_", is_flag=True, help="List all keys in the keyring, both public and private")
 @click.option("-p", "--private", is_flag=True, help="List private keys in the keyring")
 @click.option("-n", "--no-subkeys", is_flag=True, help="Omit subkeys in the list of shown keys")
-@click.pass_obj
-def ls(gpg, all_: bool, private: bool, no_subkeys: bool):  # pylint: disable=C0103
-    """Show a list of GPG keys in the keyring."""
-    public_keys = get_public_keys(gpg)
-    private_keys = get_private_keys(gpg)
+@click.pass_context
+def ls(ctx, all_: bool, private: bool, no_subkeys: bool):  # pylint: disable=C0103
+    """Show a list of GPG keys in the keyring.
+
+    When many GPG homes are selected, the keys of every home are listed under the home they belong to.
+    """
+    fleet: Fleet = ctx.meta[FLEET_META_KEY]
+    if not fleet.is_multi_home:
+        try:
+            with ctx.meta[LOCK_META_KEY].shared():
+                keys = select_keys(ctx.obj, all_, private)
+        except LockTimeoutError as ex:
+            click.secho(str(ex), fg="red")
+            sys.exit(1)
+
+        display_keys(keys, no_subkeys)
+        return
+
+    failed = False
+    for result in fleet.run(select_keys, all_, private):
+        click.echo()
+        click.secho(f"GPG home: {result.gpg_home}", bold=True)
+
+        if result.error is not None:
+            click.secho(result.error, fg="red")
+            failed = True
+        else:
+            display_keys(result.value or [], no_subkeys)
+
+    if failed:
+        sys.exit(1)
+
 
+def select_keys(gpg: "gnupg.GPG", all_: bool, private: bool) -> List[GPGKey]:
+    """Get the keys to list from the keyring.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param all_: Whether to select both public and private keys
+    :param private: Whether to select private keys instead of public keys
+    :return: The selected keys
+    """
     if all_:
         keys_to_show = []
-        keys_to_show.extend(public_keys)
-        keys_to_show.extend(private_keys)
+        keys_to_show.extend(get_public_keys(gpg))
+        keys_to_show.extend(get_private_keys(gpg))
     elif private:
-        keys_to_show = private_keys
+        keys_to_show = get_private_keys(gpg)
     else:
-        keys_to_show = public_keys
+        keys_to_show = get_public_keys(gpg)
+
+    return keys_to_show
+
 
+def display_keys(keys_to_show: List[GPGKey], no_subkeys: bool):
+    """Display keys on the terminal, grouped by owner.
+
+    :param keys_to_show: The keys to display
+    :param no_subkeys: Whether to omit the subkeys of the displayed keys
+    """
     owners_to_keys: Dict[KeyOwner, List[GPGKey]] = {}
     for key in keys_to_show:
         if key.key_owner in owners_to_keys:
@@ -36,12 +87,22 @@ def ls(gpg, all_: bool, private: bool, no_subkeys: bool):  # pylint: disable=C01
         else:
             owners_to_keys[key.key_owner] = [key]
 
-    for owner, public_keys in owners_to_keys.items():
-        click.echo()
-        display_key_owner(owner)
-        click.echo()
-        for key in public_keys:
-            display_key_oneline(key, indent="\t")
+    for owner, keys in owners_to_keys.items():
+        display_owner_keys(owner, keys, no_subkeys)
+
+
+def display_owner_keys(owner: KeyOwner, keys: Iterable[GPGKey], no_subkeys: bool):
+    """Display an owner on the terminal, followed by their keys.
+
+    :param owner: The owner of the keys
+    :param keys: The keys of the owner
+    :param no_subkeys: Whether to omit the subkeys of the displayed keys
+    """
+    click.echo()
+    display_key_owner(owner)
+    click.echo()
+    for key in keys:
+        display_key_oneline(key, indent="\t")
 
-            if key.subkeys and not no_subkeys:
-                display_subkeys_oneline(key, indent="\t  ")
+        if key.subkeys and not no_subkeys:
+            display_subkeys_oneline(key, indent="\t  ")
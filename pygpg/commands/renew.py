@@ -1,15 +1,19 @@
 """This module contains the code for the renew command."""
 import re
 import sys
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
-import gnupg
 
 from pygpg.enums.trust_value import TrustValue
-from pygpg.exceptions import KeyEditError
-from pygpg.gnupg_extension.edit_key import edit_key
+from pygpg.exceptions import KeyEditError, LockTimeoutError
+from pygpg.gnupg_extension.edit_key import edit_key, make_expire_commands
+from pygpg.utils.completion import KEY_ID, make_key_completion
 from pygpg.utils.keys import get_full_private_keys
+from pygpg.utils.lock import LOCK_META_KEY, HomeLock
+
+if TYPE_CHECKING:
+    import gnupg
 
 
 def validate_valid_duration(_ctx, _param, value: str) -> str:
@@ -41,9 +45,15 @@ def validate_key_id(ctx, _param, value: Optional[str]) -> Optional[str]:
     :param value: The value that was provided by the user
     :return: The user-supplied value, if it is valid
     """
-    if value:
+    if value and not ctx.resilient_parsing:
         value = value.strip()
-        valid_keys = get_full_private_keys(ctx.obj)
+        try:
+            with ctx.meta[LOCK_META_KEY].shared():
+                valid_keys = get_full_private_keys(ctx.obj)
+        except LockTimeoutError as ex:
+            click.secho(str(ex), fg="red")
+            sys.exit(1)
+
         supplied_key = [key for key in valid_keys if key.key_id == value]
 
         if not supplied_key:
@@ -52,15 +62,17 @@ def validate_key_id(ctx, _param, value: Optional[str]) -> Optional[str]:
     return value
 
 
-def prompt_for_key_id(gpg: gnupg.GPG) -> str:
+def prompt_for_key_id(gpg: "gnupg.GPG", lock: HomeLock) -> str:
     """Prompt the user to select a key to update.
 
     Only valid keys will be suggested to the user.
 
     :param gpg: The GPG interface used by the gnupg library
+    :param lock: The lock on the GPG home, which is only held while listing the keys
     :return: The selected key ID
     """
-    valid_private_keys = get_full_private_keys(gpg)
+    with lock.shared():
+        valid_private_keys = get_full_private_keys(gpg)
 
     if not valid_private_keys:
         click.secho("There are no keys that can be renewed in your keyring", fg="yellow")
@@ -94,6 +106,7 @@ def prompt_for_key_id(gpg: gnupg.GPG) -> str:
     "-k",
     "--key-id",
     callback=validate_key_id,
+    shell_complete=make_key_completion(private=True, kinds=(KEY_ID,)),
     help="The ID of the GPG key to edit. "
     "The key must be a primary key, and the secret key needs to be present in the keyring",
 )
@@ -105,8 +118,8 @@ def prompt_for_key_id(gpg: gnupg.GPG) -> str:
     help="Set the expiration of all subkeys of the selected key to the same date as the primary key",
 )
 @click.argument("valid_duration", callback=validate_valid_duration)
-@click.pass_obj
-def renew(gpg: gnupg.GPG, key_id: Optional[str], all_: bool, valid_duration: str):
+@click.pass_context
+def renew(ctx, key_id: Optional[str], all_: bool, valid_duration: str):
     """Renew a GPG key or otherwise change its expiration date.
 
     VALID_DURATION is the duration for which the GPG key will be valid after executing
@@ -119,20 +132,22 @@ def renew(gpg: gnupg.GPG, key_id: Optional[str], all_: bool, valid_duration: str
         <n>m = key expires in n months
         <n>y = key expires in n years
     """
-    if not key_id:
-        key_id = prompt_for_key_id(gpg)
-
-    edit_key_commands = ["expire", valid_duration]
-
-    if all_:
-        gpg_key = [key for key in get_full_private_keys(gpg) if key.key_id == key_id][0]
-        for i, _subkey in enumerate(gpg_key.subkeys):
-            edit_key_commands.extend([f"key {i + 1}", "expire", valid_duration])
+    gpg: "gnupg.GPG" = ctx.obj
+    lock: HomeLock = ctx.meta[LOCK_META_KEY]
+    try:
+        if not key_id:
+            key_id = prompt_for_key_id(gpg, lock)
 
-    edit_key_commands.append("save")
+        with lock.exclusive():
+            subkey_count = 0
+            if all_:
+                gpg_key = [key for key in get_full_private_keys(gpg) if key.key_id == key_id][0]
+                subkey_count = len(gpg_key.subkeys)
 
-    try:
-        edit_key(gpg, edit_key_commands, key_id)
+            edit_key(gpg, make_expire_commands(valid_duration, subkey_count), key_id)
     except KeyEditError as ex:
         click.secho(str(ex), fg="yellow")
         sys.exit(1)
+    except LockTimeoutError as ex:
+        click.secho(str(ex), fg="red")
+        sys.exit(1)
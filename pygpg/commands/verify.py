@@ -0,0 +1,123 @@
+"""This module contains the code for the verify command."""
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+import click
+
+from pygpg.exceptions import LockTimeoutError
+from pygpg.gnupg_extension.verify import VerificationResult, verify_detached_signature
+from pygpg.gpg_key import GPGKey
+from pygpg.utils.fleet import FLEET_META_KEY, Fleet
+from pygpg.utils.keys import build_key_index, get_public_keys
+from pygpg.utils.lock import LOCK_META_KEY
+
+SIGNATURE_EXTENSIONS = (".sig", ".asc")
+
+
+@click.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option(
+    "-p",
+    "--pair",
+    "pairs",
+    nargs=2,
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="A file and its detached signature. Can be given multiple times",
+)
+@click.option("-f", "--fail-fast", is_flag=True, help="Stop verifying signatures after the first failure")
+@click.pass_context
+def verify(ctx, paths: Tuple[str], pairs: Tuple[Tuple[str, str]], fail_fast: bool):
+    """Verify the detached signatures of many files.
+
+    PATHS are files or directories to verify. The signature of a file is expected next to it,
+    with the same name followed by `.sig` or `.asc`. Directories are walked recursively, and
+    every signature found in them is verified against the file it is named after.
+
+    Signatures are verified concurrently, and the result of each verification is shown
+    as soon as it is known.
+    """
+    to_verify = [(Path(file), Path(signature)) for file, signature in pairs]
+    for path in paths:
+        to_verify.extend(find_signature_pairs(Path(path)))
+
+    if not to_verify:
+        click.secho("No signatures were found to verify", fg="yellow")
+        sys.exit(1)
+
+    try:
+        with ctx.meta[LOCK_META_KEY].shared():
+            key_index = build_key_index(get_public_keys(ctx.obj))
+    except LockTimeoutError as ex:
+        click.secho(str(ex), fg="red")
+        sys.exit(1)
+
+    fleet: Fleet = ctx.meta[FLEET_META_KEY]
+    failed = False
+
+    with ThreadPoolExecutor(max_workers=fleet.max_workers or os.cpu_count()) as executor:
+        pending: Set[Future] = {
+            executor.submit(verify_detached_signature, ctx.obj, file, signature) for file, signature in to_verify
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                display_verification_result(result, key_index)
+                failed = failed or not result.valid
+
+            if failed and fail_fast:
+                for future in pending:
+                    future.cancel()
+                pending = {future for future in pending if not future.cancelled()}
+
+    if failed:
+        sys.exit(1)
+
+
+def find_signature_pairs(path: Path) -> List[Tuple[Path, Path]]:
+    """Find the files to verify along with their signatures.
+
+    :param path: A signed file, a detached signature, or a directory in which to look for signatures
+    :return: A list of (file, signature) tuples
+    """
+    if path.is_dir():
+        signatures = sorted(file for extension in SIGNATURE_EXTENSIONS for file in path.rglob(f"*{extension}"))
+        return [
+            (signature.with_suffix(""), signature) for signature in signatures if signature.with_suffix("").is_file()
+        ]
+
+    if path.suffix in SIGNATURE_EXTENSIONS and path.with_suffix("").is_file():
+        return [(path.with_suffix(""), path)]
+
+    for extension in SIGNATURE_EXTENSIONS:
+        signature = path.with_name(path.name + extension)
+        if signature.is_file():
+            return [(path, signature)]
+
+    click.secho(f"No signature was found for {path}", fg="yellow", err=True)
+    return []
+
+
+def display_verification_result(result: VerificationResult, key_index: Dict[str, GPGKey]):
+    """Display the result of a signature verification on a single line.
+
+    :param result: The result of the verification
+    :param key_index: The index used to find the primary key which made the signature
+    """
+    click.echo(f"{result.file}: ", nl=False)
+    if result.valid:
+        click.secho("Good signature ", fg="green", nl=False)
+    else:
+        click.secho(f"Failed ({result.status.lower()}) ", fg="red", nl=False)
+
+    signer = key_index.get((result.fingerprint or result.key_id or "").upper())
+    if signer:
+        owner_emails = [f"<{email}>" for email in signer.key_owner.emails]
+        click.secho(f"{signer.key_id} ", fg="cyan", nl=False)
+        click.secho(f"{signer.key_owner.name} {', '.join(owner_emails)}", fg="bright_black")
+    else:
+        click.secho(result.key_id or "", fg="cyan")
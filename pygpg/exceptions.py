@@ -31,3 +31,48 @@ class KeyExportError(PyGPGError):
 
         super().__init__(msg)
         self.key_id = key_id
+
+
+class RecipientError(PyGPGError):
+    """Error for recipients that cannot be resolved to a usable encryption key."""
+
+    def __init__(self, recipient: str, msg=None):
+        if msg is None:
+            msg = f"No usable encryption key was found for the recipient: {recipient}"
+
+        super().__init__(msg)
+        self.recipient = recipient
+
+
+class StreamOperationError(PyGPGError):
+    """Error for errors that occur when GPG processes a stream of data (encryption, signature, etc.)."""
+
+    def __init__(self, operation: str, msg=None):
+        if msg is None:
+            msg = f"GPG could not {operation} the data"
+
+        super().__init__(msg)
+        self.operation = operation
+
+
+class KeyFileError(PyGPGError):
+    """Error for errors that occur when reading the keys in a file without importing them."""
+
+    def __init__(self, file: str, msg=None):
+        if msg is None:
+            msg = f"There was an error reading the GPG keys in the file: {file}"
+
+        super().__init__(msg)
+        self.file = file
+
+
+class LockTimeoutError(PyGPGError):
+    """Error for when the lock on a GPG home cannot be acquired in time."""
+
+    def __init__(self, gpg_home: str, timeout: float, msg=None):
+        if msg is None:
+            msg = f"Timed out after {timeout:g}s waiting for other pygpg processes using the GPG home: {gpg_home}"
+
+        super().__init__(msg)
+        self.gpg_home = gpg_home
+        self.timeout = timeout
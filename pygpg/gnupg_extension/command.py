@@ -0,0 +1,34 @@
+"""Contains functions to build the command lines used to run GPG directly."""
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    import gnupg
+
+
+def make_base_command(gpg: "gnupg.GPG") -> List[str]:
+    """Make the part of the command line which is common to all GPG commands.
+
+    The gnupg library always adds options to produce machine readable key listings,
+    which change the output of other commands, so they are removed.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :return: The command line, without any command specific arguments
+    """
+    command = gpg.make_args([], None)
+    command.remove("--fixed-list-mode")
+    command.remove("--with-colons")
+    return command
+
+
+def make_command(gpg: "gnupg.GPG", args: List[str], base_command: Optional[List[str]] = None) -> List[str]:
+    """Make the command line to run GPG with the given arguments.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param args: The command specific arguments
+    :param base_command: The result of `make_base_command`, to avoid building it again when it is reused
+    :return: The full command line
+    """
+    if base_command is None:
+        base_command = make_base_command(gpg)
+
+    return [*base_command, *args]
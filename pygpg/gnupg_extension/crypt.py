@@ -0,0 +1,70 @@
+"""Contains functions to encrypt, decrypt and sign streams of data with GPG."""
+from typing import TYPE_CHECKING, BinaryIO, List, Optional
+
+from pygpg.gnupg_extension.command import make_command
+from pygpg.gnupg_extension.stream import StreamResult, stream_command
+
+if TYPE_CHECKING:
+    import gnupg
+
+
+def encrypt_stream(
+    gpg: "gnupg.GPG", source: BinaryIO, sink: BinaryIO, recipients: List[str], armor: bool = False
+) -> StreamResult:
+    """Encrypt a stream of data for one or many recipients.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param source: The binary stream containing the data to encrypt
+    :param sink: The binary stream to which the encrypted data is written
+    :param recipients: The key IDs or fingerprints of the keys for which to encrypt the data
+    :param armor: Whether to produce ASCII armored output instead of binary output
+    :return: Information about the processed stream
+    """
+    args = ["--encrypt"]
+    if armor:
+        args.append("--armor")
+    for recipient in recipients:
+        args.extend(["--recipient", recipient])
+
+    command = make_command(gpg, args)
+    return stream_command(command, source, sink, "encrypt")
+
+
+def decrypt_stream(gpg: "gnupg.GPG", source: BinaryIO, sink: BinaryIO) -> StreamResult:
+    """Decrypt a stream of data.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param source: The binary stream containing the encrypted data
+    :param sink: The binary stream to which the decrypted data is written
+    :return: Information about the processed stream
+    """
+    command = make_command(gpg, ["--decrypt"])
+    return stream_command(command, source, sink, "decrypt")
+
+
+def sign_stream(  # pylint: disable=R0913
+    gpg: "gnupg.GPG",
+    source: BinaryIO,
+    sink: BinaryIO,
+    local_user: Optional[str] = None,
+    detach: bool = False,
+    armor: bool = False,
+) -> StreamResult:
+    """Sign a stream of data.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param source: The binary stream containing the data to sign
+    :param sink: The binary stream to which the signed data (or the detached signature) is written
+    :param local_user: The ID of the key to sign with, or None to use GPG's default key
+    :param detach: Whether to produce a detached signature instead of a signed message
+    :param armor: Whether to produce ASCII armored output instead of binary output
+    :return: Information about the processed stream
+    """
+    args = ["--detach-sign" if detach else "--sign"]
+    if armor:
+        args.append("--armor")
+    if local_user:
+        args.extend(["--local-user", local_user])
+
+    command = make_command(gpg, args)
+    return stream_command(command, source, sink, "sign")
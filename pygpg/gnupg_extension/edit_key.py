@@ -1,13 +1,17 @@
-"""Contains a function which allows editing a GPG key non-interactively."""
+"""Contains functions to edit GPG keys non-interactively."""
 import subprocess
-from typing import List, Tuple
-
-import gnupg
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from pygpg.exceptions import KeyEditError
+from pygpg.gnupg_extension.command import make_command
+
+if TYPE_CHECKING:
+    import gnupg
 
 
-def edit_key(gpg: gnupg.GPG, commands: List[str], key_id: str) -> Tuple[str, str]:
+def edit_key(
+    gpg: "gnupg.GPG", commands: List[str], key_id: str, base_command: Optional[List[str]] = None
+) -> Tuple[str, str]:
     """Edit a given GPG key's attributes.
 
     This function extends the functionality provided by the gnupg library, because
@@ -23,11 +27,10 @@ def edit_key(gpg: gnupg.GPG, commands: List[str], key_id: str) -> Tuple[str, str
                      should be the same as what would be entered in the interactive
                      menu produced by `gpg --edit-key {key_id}`.
     :param key_id: The ID of the key to edit
+    :param base_command: The base GPG command line, if it was already built (see `make_base_command`)
     :return: A tuple formed with (stdout, stderr), with both streams as strings
     """
-    command = gpg.make_args(["--command-fd", "0", "--edit-key", key_id], None)
-    command.remove("--fixed-list-mode")
-    command.remove("--with-colons")
+    command = make_command(gpg, ["--command-fd", "0", "--edit-key", key_id], base_command)
     full_edit_command_string = "\n".join(commands) + "\n"
 
     try:
@@ -38,3 +41,18 @@ def edit_key(gpg: gnupg.GPG, commands: List[str], key_id: str) -> Tuple[str, str
         raise KeyEditError(key_id) from ex
 
     return result.stdout.decode("utf-8"), result.stderr.decode("utf-8")
+
+
+def make_expire_commands(valid_duration: str, subkey_count: int = 0) -> List[str]:
+    """Make the edit commands to change the expiration date of a key and, optionally, of its subkeys.
+
+    :param valid_duration: The duration for which the key will be valid (e.g. "0", "2y", "6m")
+    :param subkey_count: The number of subkeys to which the same expiration date is applied
+    :return: The list of commands to give to `edit_key`, including the final "save" command
+    """
+    edit_key_commands = ["expire", valid_duration]
+    for i in range(subkey_count):
+        edit_key_commands.extend([f"key {i + 1}", "expire", valid_duration])
+
+    edit_key_commands.append("save")
+    return edit_key_commands
@@ -1,39 +1,39 @@
 """Contains functions to export GPG keys."""
 import subprocess
-from typing import List, Tuple
-
-import gnupg
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from pygpg.exceptions import KeyExportError
+from pygpg.gnupg_extension.command import make_command
+
+if TYPE_CHECKING:
+    import gnupg
 
 
-def export_secret_subkeys(gpg: gnupg.GPG, key_id: str) -> Tuple[str, str]:
+def export_secret_subkeys(gpg: "gnupg.GPG", key_id: str, base_command: Optional[List[str]] = None) -> Tuple[str, str]:
     """Export the secret subkeys for a given GPG key.
 
     :param gpg: The GPG interface used by the gnupg library
     :param key_id: The ID of the key for which to export subkeys
+    :param base_command: The base GPG command line, if it was already built (see `make_base_command`)
     :return: The GPG private key block (stdout) and stderr
     """
-    command = gpg.make_args(["--armor", "--export-secret-subkeys", key_id], None)
-    command.remove("--fixed-list-mode")
-    command.remove("--with-colons")
+    command = make_command(gpg, ["--armor", "--export-secret-subkeys", key_id], base_command)
     return run_export_command(command, key_id)
 
 
-def export_public_key(gpg: gnupg.GPG, key_id: str) -> Tuple[str, str]:
+def export_public_key(gpg: "gnupg.GPG", key_id: str, base_command: Optional[List[str]] = None) -> Tuple[str, str]:
     """Export a GPG public key.
 
     :param gpg: The GPG interface used by the gnupg library
     :param key_id: The ID of the key for which to create a backup
+    :param base_command: The base GPG command line, if it was already built (see `make_base_command`)
     :return: The backed up key dats (stdout) and stderr
     """
-    command = gpg.make_args(["--armor", "--export", key_id], None)
-    command.remove("--fixed-list-mode")
-    command.remove("--with-colons")
+    command = make_command(gpg, ["--armor", "--export", key_id], base_command)
     return run_export_command(command, key_id)
 
 
-def export_private_key(gpg: gnupg.GPG, key_id: str) -> Tuple[str, str]:
+def export_private_key(gpg: "gnupg.GPG", key_id: str, base_command: Optional[List[str]] = None) -> Tuple[str, str]:
     """Export all necessary information about a key to restore it.
 
     From the GPG man pages:
@@ -42,11 +42,10 @@ def export_private_key(gpg: gnupg.GPG, key_id: str) -> Tuple[str, str]:
 
     :param gpg: The GPG interface used by the gnupg library
     :param key_id: The ID of the key for which to create a backup
+    :param base_command: The base GPG command line, if it was already built (see `make_base_command`)
     :return: The backed up key dats (stdout) and stderr
     """
-    command = gpg.make_args(["--armor", "--export-secret-keys", key_id], None)
-    command.remove("--fixed-list-mode")
-    command.remove("--with-colons")
+    command = make_command(gpg, ["--armor", "--export-secret-keys", key_id], base_command)
     return run_export_command(command, key_id)
 
 
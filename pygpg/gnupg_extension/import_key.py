@@ -0,0 +1,209 @@
+"""Contains functions to import GPG keys with a bounded amount of memory."""
+import hashlib
+import itertools
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterator, List, Optional, Tuple
+
+from pygpg.exceptions import LockTimeoutError
+from pygpg.utils.files import atomic_write
+from pygpg.utils.key_blocks import iter_key_batches
+from pygpg.utils.lock import HomeLock
+
+if TYPE_CHECKING:
+    import gnupg
+
+IMPORT_OPTIONS = ["--import-options", "restore"]
+IMPORT_QUEUE_DIR_NAME = ".pygpg-import-queue"
+
+
+def import_key_batches(
+    gpg: "gnupg.GPG", stream: BinaryIO, max_batch_size: int, lock: Optional[HomeLock] = None
+) -> Iterator[Tuple[int, int]]:
+    """Import GPG keys from a binary stream, in batches of bounded size.
+
+    The stream is split on armor or packet boundaries while it is read, and each batch
+    of keys is imported by GPG before the next one is read. A `ValueError` is raised if
+    the stream turns out not to contain valid keys.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param stream: The binary stream from which to import keys
+    :param max_batch_size: The maximum amount of key data to send to GPG at once, in bytes
+    :param lock: The lock on the GPG home, to queue the batches with those of other processes (see `ImportQueue`)
+    :return: An iterator over the running totals of imported keys and bytes read, after each batch
+    """
+    queue = ImportQueue(gpg, lock, max_batch_size) if lock is not None else None
+    imported_count = 0
+    bytes_read = 0
+    for batch, key_count in iter_key_batches(stream, max_batch_size):
+        imported_count += queue.import_batch(batch, key_count) if queue else import_keys_data(gpg, batch)
+        bytes_read += len(batch)
+        yield imported_count, bytes_read
+
+
+def import_keys_data(gpg: "gnupg.GPG", data: bytes) -> int:
+    """Import GPG keys with a single GPG invocation.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param data: The key data, either ASCII armored or binary
+    :return: The amount of keys processed by GPG
+    """
+    return gpg.import_keys(data, extra_args=IMPORT_OPTIONS).count
+
+
+class ImportQueue:
+    """A queue of key imports, shared by the pygpg processes which use a GPG home.
+
+    When the GPG home is in use, each batch of keys is written to a spool directory in the home
+    before waiting for the exclusive lock on the home. The process which gets the lock imports all
+    the queued batches with a single GPG invocation, and leaves the outcome of each batch for the
+    process which queued it, so concurrent imports are coalesced instead of each running GPG in
+    turn. Processes only share a queue when they run GPG with the same command line (binary,
+    keyrings and options). A batch only stays in the queue while the process which queued it waits
+    for it: the process removes it when it stops waiting for any reason, and batches of processes
+    which were killed are skipped.
+
+    Batches are binary key data (see `iter_key_batches`), so they can be concatenated. GPG only
+    reports a total for a coalesced import, so each batch gets its own amount of keys when GPG
+    processes all the queued keys. Otherwise (because some keys are invalid, or GPG gave up on
+    the data, for example), each batch is imported again on its own to get its exact outcome.
+    """
+
+    def __init__(self, gpg: "gnupg.GPG", lock: HomeLock, max_import_size: int):
+        self.gpg = gpg
+        self.lock = lock
+        self.max_import_size = max_import_size
+        settings_digest = hashlib.sha256("\0".join(gpg.make_args([], None)).encode("utf-8")).hexdigest()
+        self.queue_dir = lock.path.parent / IMPORT_QUEUE_DIR_NAME / settings_digest[:16]
+        self._sequence = itertools.count()
+
+    def import_batch(self, data: bytes, key_count: int) -> int:
+        """Import a batch of keys right away if the GPG home is not in use, or queue it until it is imported.
+
+        :param data: The binary key data
+        :param key_count: The amount of keys in the data
+        :return: The amount of keys of the batch processed by GPG
+        """
+        try:
+            with HomeLock(self.lock.state, timeout=0).exclusive():
+                return import_keys_data(self.gpg, data)
+        except LockTimeoutError:
+            pass  # The GPG home is in use, so the batch is queued to be coalesced with those of other processes
+
+        try:
+            self.queue_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            queued_at = int(time.time() * 1000000)
+            entry = self.queue_dir / f"{queued_at:020d}-{os.getpid()}-{next(self._sequence)}-{key_count}.keys"
+            with atomic_write(entry, 0o600) as file:
+                file.write(data)
+        except OSError:  # The queue cannot be used (e.g. the GPG home is read-only), so import the batch on its own
+            with self.lock.exclusive():
+                return import_keys_data(self.gpg, data)
+
+        result_file = entry.with_suffix(".result")
+        try:
+            with self.lock.exclusive():
+                while not result_file.exists() and self.drain():
+                    pass
+
+                if not result_file.exists():  # The entry was removed from the queue without being imported
+                    return import_keys_data(self.gpg, data)
+
+                return int(result_file.read_text(encoding="utf-8"))
+        finally:
+            remove_file(entry)
+            remove_file(result_file)
+
+    def drain(self) -> bool:
+        """Import the oldest batches in the queue with a single GPG invocation, which requires the exclusive lock.
+
+        Batches are taken in the order they were queued, until the maximum import size is reached. The
+        batches and outcomes left in the queue by processes which no longer exist are removed.
+
+        :return: Whether or not any batch was imported
+        """
+        entries: List[Path] = []
+        batches: List[bytes] = []
+        key_counts: List[int] = []
+        import_size = 0
+        for result_file in self.queue_dir.glob("*.result"):
+            if not is_process_alive(get_owner_pid(result_file)):
+                remove_file(result_file)
+
+        for entry in sorted(self.queue_dir.glob("*.keys")):
+            if not is_process_alive(get_owner_pid(entry)):
+                remove_file(entry)
+                continue
+
+            try:
+                if entries and import_size + entry.stat().st_size > self.max_import_size:
+                    break
+
+                batches.append(entry.read_bytes())
+            except FileNotFoundError:  # The process which queued the batch gave up waiting for it
+                continue
+
+            entries.append(entry)
+            key_counts.append(int(entry.stem.rsplit("-", 1)[1]))
+            import_size += len(batches[-1])
+
+        if not entries:
+            return False
+
+        imported_count = import_keys_data(self.gpg, b"".join(batches))
+        if len(batches) == 1:
+            key_counts = [imported_count]
+        elif imported_count != sum(key_counts):
+            key_counts = [import_keys_data(self.gpg, batch) for batch in batches]
+
+        for entry, imported_count in zip(entries, key_counts):
+            result_file = entry.with_suffix(".result")
+            with atomic_write(result_file, 0o600) as file:
+                file.write(str(imported_count).encode("utf-8"))
+
+            try:
+                entry.unlink()
+            except FileNotFoundError:  # The process which queued the batch stopped waiting for it while it was imported
+                remove_file(result_file)
+
+        return True
+
+
+def remove_file(path: Path):
+    """Remove a file, if it still exists.
+
+    :param path: The path of the file to remove
+    """
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def get_owner_pid(path: Path) -> int:
+    """Get the ID of the process which queued a batch.
+
+    :param path: The path of the batch or of its outcome in the queue
+    :return: The process ID
+    """
+    return int(path.name.split("-")[1])
+
+
+def is_process_alive(pid: int) -> bool:
+    """Check whether a process is still running.
+
+    :param pid: The process ID
+    :return: Whether or not the process exists, which is assumed when it cannot be checked
+    """
+    if os.name != "posix":  # Signals cannot be used to check for processes outside of POSIX systems
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # The process exists, but belongs to another user
+        return True
+
+    return True
@@ -0,0 +1,23 @@
+"""Contains a function to list the signatures on the keys of a keyring."""
+import io
+import subprocess
+from typing import TYPE_CHECKING, Iterator, List, cast
+
+if TYPE_CHECKING:
+    import gnupg
+
+
+def list_signatures(gpg: "gnupg.GPG") -> Iterator[List[str]]:
+    """List the keys in the keyring along with the signatures on their user IDs and subkeys.
+
+    The output of GPG is read one line at a time, so memory usage does not depend on the
+    size of the keyring. The format of the records is documented
+    [here](https://github.com/gpg/gnupg/blob/master/doc/DETAILS#format-of-the-colon-listings).
+
+    :param gpg: The GPG interface used by the gnupg library
+    :return: An iterator over the records of the listing, each split on colons
+    """
+    command = gpg.make_args(["--list-sigs"], None)
+    with subprocess.Popen(command, shell=False, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as process:
+        for line in io.TextIOWrapper(cast(io.BufferedReader, process.stdout), encoding="utf-8", errors="replace"):
+            yield line.rstrip("\n").split(":")
@@ -0,0 +1,47 @@
+"""Contains a function to list the keys in a file without importing them."""
+import io
+import subprocess
+from typing import TYPE_CHECKING, Dict, Iterator, Union, cast
+
+from pygpg.exceptions import KeyFileError
+
+if TYPE_CHECKING:
+    import gnupg
+
+LISTING_KEYWORDS = {"pub", "sec", "uid", "fpr", "sub", "ssb", "sig", "grp"}
+
+
+def show_keys(gpg: "gnupg.GPG", file: str) -> Iterator[Dict[str, Union[str, Dict]]]:
+    """List the keys contained in a key file, without importing them in the keyring.
+
+    The output of GPG is parsed one line at a time, and each key is yielded as soon as all of
+    its records have been read, so memory usage does not depend on the size of the file. The
+    keys have the same format as the dicts returned by `gpg.list_keys()`.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param file: The path of the key file, or `-` to read from standard input
+    :return: An iterator over the keys in the file, as dicts
+    """
+    # The gnupg library is imported here to keep it off the shell completion path
+    import gnupg  # pylint: disable=C0415
+
+    command = gpg.make_args(["--show-keys", "--fingerprint", "--fingerprint", file], None)
+    with subprocess.Popen(command, shell=False, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as process:
+        listing = gnupg.ListKeys(gpg)
+        for line in io.TextIOWrapper(cast(io.BufferedReader, process.stdout), encoding="utf-8", errors="replace"):
+            fields = line.strip().split(":")
+            keyword = fields[0]
+            if keyword not in LISTING_KEYWORDS:
+                continue
+
+            if keyword in ("pub", "sec") and listing:
+                yield listing[0]
+                listing = gnupg.ListKeys(gpg)
+
+            getattr(listing, keyword)(fields)
+
+    if listing:
+        yield listing[0]
+
+    if process.returncode != 0:
+        raise KeyFileError(file)
@@ -0,0 +1,98 @@
+"""Contains a function to pipe a stream of data through a GPG process in fixed-size chunks."""
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import BinaryIO, List, cast
+
+from pygpg.exceptions import StreamOperationError
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class StreamResult:
+    """Contains information about a stream of data that was processed by GPG."""
+
+    bytes_read: int
+    bytes_written: int
+    stderr: str
+
+
+def stream_command(
+    command: List[str], source: BinaryIO, sink: BinaryIO, operation: str, chunk_size: int = CHUNK_SIZE
+) -> StreamResult:
+    """Run a GPG command that reads from stdin and writes to stdout, without buffering the data in memory.
+
+    The data is copied from the source to GPG and from GPG to the sink in chunks of at most `chunk_size`
+    bytes, so memory usage stays the same regardless of the amount of data. Writing to GPG happens in a
+    separate thread to avoid a deadlock when both pipes are full.
+
+    :param command: The command to execute
+    :param source: The binary stream from which to read the data sent to GPG
+    :param sink: The binary stream to which the output of GPG is written
+    :param operation: The name of the operation, used in error messages (e.g. "encrypt")
+    :param chunk_size: The maximum amount of bytes to copy at once
+    :return: The amount of bytes that were read and written, along with GPG's stderr
+    """
+    process = subprocess.Popen(  # pylint: disable=R1732
+        command, shell=False, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    bytes_read = [0]
+    stderr_data: List[bytes] = []
+
+    threads = [
+        threading.Thread(target=feed_stdin, args=(source, process.stdin, chunk_size, bytes_read), daemon=True),
+        threading.Thread(target=lambda: stderr_data.append(cast(BinaryIO, process.stderr).read()), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    bytes_written = copy_in_chunks(cast(BinaryIO, process.stdout), sink, chunk_size)
+
+    for thread in threads:
+        thread.join()
+    cast(BinaryIO, process.stdout).close()
+
+    stderr_text = b"".join(stderr_data).decode("utf-8", errors="replace")
+    if process.wait() != 0:
+        messages = [line for line in stderr_text.splitlines() if line and not line.startswith("[GNUPG:]")]
+        raise StreamOperationError(operation, messages[-1] if messages else None)
+
+    return StreamResult(bytes_read=bytes_read[0], bytes_written=bytes_written, stderr=stderr_text)
+
+
+def copy_in_chunks(source: BinaryIO, sink: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """Copy all the data from a binary stream to another, in chunks of a fixed maximum size.
+
+    :param source: The binary stream to read from
+    :param sink: The binary stream to write to
+    :param chunk_size: The maximum amount of bytes to copy at once
+    :return: The amount of bytes that were copied
+    """
+    copied = 0
+    for chunk in iter(lambda: source.read(chunk_size), b""):
+        sink.write(chunk)
+        copied += len(chunk)
+
+    return copied
+
+
+def feed_stdin(source: BinaryIO, stdin: BinaryIO, chunk_size: int, bytes_read: List[int]):
+    """Copy the data from a binary stream to a process's stdin, then close it.
+
+    :param source: The binary stream to read from
+    :param stdin: The stdin of the process
+    :param chunk_size: The maximum amount of bytes to copy at once
+    :param bytes_read: A single item list in which the amount of copied bytes is accumulated
+    """
+    try:
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            stdin.write(chunk)
+            bytes_read[0] += len(chunk)
+    except BrokenPipeError:
+        pass  # The process stopped reading, so the error is reported through its exit code
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
@@ -0,0 +1,70 @@
+"""Contains a function to verify detached signatures."""
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from pygpg.gnupg_extension.command import make_command
+
+if TYPE_CHECKING:
+    import gnupg
+
+SIGNATURE_STATUSES = {"GOODSIG", "BADSIG", "EXPSIG", "EXPKEYSIG", "REVKEYSIG", "ERRSIG"}
+
+
+@dataclass
+class VerificationResult:
+    """Contains the outcome of the verification of a detached signature."""
+
+    file: Path
+    signature: Path
+    status: str
+    key_id: Optional[str] = None
+    fingerprint: Optional[str] = None
+
+    @property
+    def valid(self) -> bool:
+        """Whether or not the signature is good."""
+        return self.status == "GOODSIG"
+
+
+def verify_detached_signature(gpg: "gnupg.GPG", file: Path, signature: Path) -> VerificationResult:
+    """Verify a detached signature for a file.
+
+    The outcome is taken from the status lines GPG writes to stderr, see the documentation
+    [here](https://github.com/gpg/gnupg/blob/master/doc/DETAILS#format-of-the-status-fd-output).
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param file: The file that was signed
+    :param signature: The detached signature of the file
+    :return: The outcome of the verification
+    """
+    command = make_command(gpg, ["--verify", str(signature), str(file)])
+    result = subprocess.run(command, shell=False, stdin=subprocess.DEVNULL, capture_output=True, check=False)
+
+    statuses = parse_status_lines(result.stderr.decode("utf-8", errors="replace"))
+    status = next((keyword for keyword in statuses if keyword in SIGNATURE_STATUSES), "NOSIG")
+    if status == "GOODSIG" and result.returncode != 0:
+        status = "ERROR"
+
+    key_id = statuses[status][0] if statuses.get(status) else None
+    fingerprint = None
+    if len(statuses.get("VALIDSIG", [])) >= 10:
+        fingerprint = statuses["VALIDSIG"][9]
+
+    return VerificationResult(file=file, signature=signature, status=status, key_id=key_id, fingerprint=fingerprint)
+
+
+def parse_status_lines(stderr: str) -> Dict[str, List[str]]:
+    """Parse the status lines GPG writes when it is given `--status-fd`.
+
+    :param stderr: The output in which the status lines were written
+    :return: A mapping of status keywords to their arguments, in the order they were written
+    """
+    statuses: Dict[str, List[str]] = {}
+    for line in stderr.splitlines():
+        if line.startswith("[GNUPG:] "):
+            keyword, *args = line.split(" ")[1:]
+            statuses.setdefault(keyword, args)
+
+    return statuses
@@ -0,0 +1,172 @@
+"""Contains a class to use a GPG keyring from Python code."""
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from pygpg.enums.key_token import KeyToken
+from pygpg.exceptions import KeyEditError
+from pygpg.gnupg_extension.command import make_base_command
+from pygpg.gnupg_extension.edit_key import edit_key, make_expire_commands
+from pygpg.gnupg_extension.export_key import export_private_key, export_public_key, export_secret_subkeys
+from pygpg.gnupg_extension.import_key import import_key_batches
+from pygpg.gpg_key import GPGKey
+from pygpg.utils.fleet import GPGSettings
+from pygpg.utils.keys import build_key_index
+from pygpg.utils.lock import DEFAULT_LOCK_TIMEOUT, get_home_lock
+
+DEFAULT_MAX_BATCH_SIZE = 16 * 1024 * 1024
+
+
+class Keyring:
+    """A GPG keyring, for use as a library.
+
+    A keyring owns a single configured GPG interface and keeps state that can be shared
+    between operations: the base GPG command line is only built once, and key listings
+    are parsed once and kept in memory. Operations that change the keyring through this
+    object invalidate the listings, but changes made by other means (another process, for
+    example) are only seen after calling `invalidate`.
+
+    Like the CLI, a keyring takes the advisory lock on its GPG home: reads share it, changes hold it
+    exclusively, and imports are coalesced with those of other processes. The lock also coordinates
+    the threads of a process, whichever keyring they use. Waiting for the lock for longer than this
+    keyring's `lock_timeout` seconds raises a `LockTimeoutError`, and the total time this keyring spent
+    waiting is available in `lock.wait_time`.
+    """
+
+    def __init__(
+        self,
+        gpg_home: Optional[str] = None,
+        gpg_binary: Optional[str] = None,
+        keyring: Optional[str] = None,
+        use_agent: bool = False,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+    ):  # pylint: disable=R0913
+        self.gpg = GPGSettings(gpg_binary=gpg_binary, use_agent=use_agent, keyring=keyring).make_gpg(gpg_home)
+        self.lock = get_home_lock(gpg_home, lock_timeout)
+        self._base_command: Optional[List[str]] = None
+        self._keys: Dict[bool, List[GPGKey]] = {}
+        self._key_indexes: Dict[bool, Dict[str, GPGKey]] = {}
+
+    @property
+    def base_command(self) -> List[str]:
+        """The part of the GPG command line which is common to all the commands run for this keyring."""
+        if self._base_command is None:
+            self._base_command = make_base_command(self.gpg)
+
+        return self._base_command
+
+    def invalidate(self):
+        """Forget the key listings, so that they are fetched from GPG again when they are needed."""
+        self._keys.clear()
+        self._key_indexes.clear()
+
+    def list_keys(self, private: bool = False) -> List[GPGKey]:
+        """Get the keys in the keyring.
+
+        :param private: Whether to get the private keys instead of the public keys
+        :return: The list of keys in the keyring
+        """
+        if private not in self._keys:
+            with self.lock.shared():
+                self._keys[private] = [GPGKey.from_gpg_key_dict(key) for key in self.gpg.list_keys(private)]
+
+        return self._keys[private]
+
+    def find(self, identifier: str, private: bool = False) -> Optional[GPGKey]:
+        """Find a primary key in the keyring.
+
+        :param identifier: The ID or fingerprint of the key or of one of its subkeys, or the email of its owner
+        :param private: Whether to search the private keys instead of the public keys
+        :return: The primary key, or None if there is no such key in the keyring
+        """
+        if "@" in identifier:
+            email = identifier.lower()
+            return next(
+                (key for key in self.list_keys(private) if email in (mail.lower() for mail in key.key_owner.emails)),
+                None,
+            )
+
+        if private not in self._key_indexes:
+            self._key_indexes[private] = build_key_index(self.list_keys(private))
+
+        return self._key_indexes[private].get(identifier.upper())
+
+    def import_keys(self, data: bytes) -> int:
+        """Import keys into the keyring.
+
+        :param data: The key data, either ASCII armored or binary
+        :return: The amount of imported keys
+        """
+        return self.import_stream(BytesIO(data))
+
+    def import_file(self, file: Union[str, Path], max_batch_size: int = DEFAULT_MAX_BATCH_SIZE) -> int:
+        """Import keys from a file, reading it progressively so that files of any size can be imported.
+
+        :param file: The path of the file from which to import keys
+        :param max_batch_size: The maximum amount of key data to send to GPG at once, in bytes
+        :return: The amount of imported keys
+        """
+        with open(file, "rb") as open_file:
+            return self.import_stream(open_file, max_batch_size)
+
+    def import_stream(self, stream: BinaryIO, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE) -> int:
+        """Import keys from a binary stream, in batches of bounded size.
+
+        :param stream: The binary stream from which to import keys
+        :param max_batch_size: The maximum amount of key data to send to GPG at once, in bytes
+        :return: The amount of imported keys
+        """
+        imported_count = 0
+        try:
+            for imported_count, _bytes_read in import_key_batches(self.gpg, stream, max_batch_size, self.lock):
+                pass
+        finally:
+            self.invalidate()
+
+        return imported_count
+
+    def export(self, key_id: str, private: bool = False) -> str:
+        """Export a key from the keyring.
+
+        :param key_id: The ID of the primary key to export
+        :param private: Whether to export the private key instead of the public key
+        :return: The ASCII armored key
+        """
+        with self.lock.shared():
+            if private:
+                export_output, _err = export_private_key(self.gpg, key_id, self.base_command)
+            else:
+                export_output, _err = export_public_key(self.gpg, key_id, self.base_command)
+
+        return export_output
+
+    def export_secret_subkeys(self, key_id: str) -> str:
+        """Export the secret subkeys of a key, along with a stub of its primary private key.
+
+        :param key_id: The ID of the primary key for which to export the secret subkeys
+        :return: The ASCII armored private key block
+        """
+        with self.lock.shared():
+            export_output, _err = export_secret_subkeys(self.gpg, key_id, self.base_command)
+
+        return export_output
+
+    def renew(self, key_id: str, valid_duration: str, all_subkeys: bool = False):
+        """Change the expiration date of a key.
+
+        :param key_id: The ID of the primary key to renew, for which the private key must be in the keyring
+        :param valid_duration: The duration for which the key will be valid, in the format used by the `renew` command
+        :param all_subkeys: Whether to also apply the same expiration date to all the subkeys of the key
+        :raises KeyEditError: If there is no full private key (not stubbed) with that ID in the keyring
+        """
+        with self.lock.exclusive():
+            key = self.find(key_id, private=True)
+            if key is None or key.key_token != KeyToken.FULL:
+                raise KeyEditError(key_id, f"There is no full private key (not stubbed) with the ID: {key_id}")
+
+            subkey_count = len(key.subkeys) if all_subkeys else 0
+
+            try:
+                edit_key(self.gpg, make_expire_commands(valid_duration, subkey_count), key_id, self.base_command)
+            finally:
+                self.invalidate()
@@ -1,21 +1,50 @@
 """Main entrypoint for the CLI."""
 import sys
-from typing import Optional
+from typing import List, Optional
 
 import click
-import gnupg
 
+from pygpg.commands.crypt import decrypt, encrypt, encrypt_tree, sign
+from pygpg.commands.graph import graph
 from pygpg.commands.import_export import export, export_subkeys, import_key
+from pygpg.commands.inspect import inspect
 from pygpg.commands.ls import ls
 from pygpg.commands.renew import renew
+from pygpg.commands.verify import verify
+from pygpg.exceptions import LockTimeoutError
+from pygpg.utils.completion import update_completion_index
+from pygpg.utils.fleet import FLEET_META_KEY, Fleet, GPGSettings, resolve_gpg_homes
+from pygpg.utils.lock import DEFAULT_LOCK_TIMEOUT, LOCK_META_KEY, get_home_lock
+from pygpg.utils.timings import TIMINGS_META_KEY, report_duration
+
+FLEET_COMMANDS = {"ls", "export"}
+
+
+def validate_gpg_home(_ctx, _param, value: Optional[str]) -> Optional[List[str]]:
+    """Validate the GPG home(s) supplied by the user.
+
+    :param _ctx: The click context
+    :param _param: The parameter that is being validated
+    :param value: The value that was provided by the user
+    :return: The list of GPG home directories matched by the value, if any matched
+    """
+    if value is None:
+        return None
+
+    gpg_homes = resolve_gpg_homes(value)
+    if not gpg_homes:
+        raise click.BadParameter("must be a directory, a glob matching directories, or a file listing directories")
+
+    return gpg_homes
 
 
 @click.group()
 @click.option(
     "--gpg-home",
-    type=click.Path(exists=True, dir_okay=True, file_okay=False),
+    callback=validate_gpg_home,
     envvar="GPG_HOME",
-    help="Path to the GPG home directory",
+    help="Path to the GPG home directory. "
+    "This can also be a glob or a file listing one directory per line to operate on many homes at once",
 )
 @click.option(
     "--gpg-binary",
@@ -35,36 +64,81 @@ from pygpg.commands.renew import renew
     envvar="KEYRING",
     help="Path to the GPG keyring file to use",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    envvar="PYGPG_JOBS",
+    help="Maximum number of GPG homes or files to operate on concurrently (defaults to the number of CPUs)",
+)
+@click.option(
+    "--lock-timeout",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_LOCK_TIMEOUT,
+    show_default=True,
+    envvar="PYGPG_LOCK_TIMEOUT",
+    help="Maximum number of seconds to wait for other pygpg processes using the same GPG home",
+)
+@click.option("--timings", is_flag=True, help="Report how long operations take and their throughput on stderr")
 @click.pass_context
 def main(
-    ctx, gpg_home: Optional[click.Path], gpg_binary: Optional[click.Path], use_agent: bool, keyring: Optional[str]
-):
+    ctx,
+    gpg_home: Optional[List[str]],
+    gpg_binary: Optional[click.Path],
+    use_agent: bool,
+    keyring: Optional[str],
+    jobs: Optional[int],
+    lock_timeout: float,
+    timings: bool,
+):  # pylint: disable=R0913
     """A thin wrapper around GPG with friendlier command line options!"""
-    gpg = gnupg.GPG() if gpg_home else gnupg.GPG()
-
+    settings = GPGSettings(
+        gpg_binary=str(gpg_binary) if gpg_binary else None,
+        use_agent=use_agent,
+        keyring=keyring,
+        lock_timeout=lock_timeout,
+    )
+    gpg_homes: List[Optional[str]] = [None]
     if gpg_home:
-        gpg.gnupghome = str(gpg_home)
-    if gpg_binary:
-        gpg.gpgbinary = str(gpg_binary)
-    if use_agent:
-        gpg.use_agent = use_agent
-    if keyring:
-        gpg.keyring = keyring
+        gpg_homes = list(gpg_home)
 
-    ctx.obj = gpg
+    fleet = Fleet(settings=settings, gpg_homes=gpg_homes, max_workers=jobs)
+
+    if fleet.is_multi_home and ctx.invoked_subcommand not in FLEET_COMMANDS:
+        click.secho(f"The {ctx.invoked_subcommand} command can only operate on a single GPG home", fg="red")
+        sys.exit(1)
+
+    lock = get_home_lock(fleet.gpg_homes[0], lock_timeout)
+    if timings:
+        ctx.call_on_close(lambda: report_duration("Waiting for the GPG home lock", lock.wait_time))
 
     try:
-        gpg.list_keys()  # Test that the GPG executable is usable
-    except OSError as ex:
+        gpg = settings.make_gpg(fleet.gpg_homes[0])
+        with lock.shared():
+            gpg.list_keys()  # Test that the GPG executable is usable
+            update_completion_index(gpg)
+    except (OSError, LockTimeoutError) as ex:
         click.secho(str(ex), fg="red")
         sys.exit(1)
 
+    ctx.obj = gpg
+    ctx.meta[FLEET_META_KEY] = fleet
+    ctx.meta[LOCK_META_KEY] = lock
+    ctx.meta[TIMINGS_META_KEY] = timings
+
 
 main.add_command(ls)
 main.add_command(renew)
 main.add_command(import_key)
 main.add_command(export_subkeys)
 main.add_command(export)
+main.add_command(encrypt)
+main.add_command(encrypt_tree)
+main.add_command(decrypt)
+main.add_command(sign)
+main.add_command(verify)
+main.add_command(inspect)
+main.add_command(graph)
 
 
 if __name__ == "__main__":
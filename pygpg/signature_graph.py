@@ -0,0 +1,161 @@
+"""Contains a dataclass to represent the certifications between the keys of a keyring."""
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CERTIFICATION_CLASSES = {"10", "11", "12", "13"}
+CERTIFICATION_REVOCATION_CLASS = "30"
+
+
+@dataclass
+class SignatureGraph:
+    """Contains the certifications between keys, as an adjacency index keyed by key ID.
+
+    An edge goes from the key that made a certification (the signer) to the primary key
+    whose user ID was certified. Key IDs are the long (16 hexadecimal characters) IDs of
+    primary keys, in upper case. The emails of all the user IDs of each key are indexed in
+    lower case, while the first user ID of each key is kept as its name.
+    """
+
+    certifications: Dict[str, List[str]] = field(default_factory=dict)
+    names: Dict[str, str] = field(default_factory=dict)
+    emails: Dict[str, str] = field(default_factory=dict)
+
+    @staticmethod
+    def from_colon_records(records: Iterable[List[str]]) -> "SignatureGraph":
+        """Create a SignatureGraph from the records of `gpg --list-sigs --with-colons`.
+
+        Self-signatures, subkey binding signatures and revoked certifications are ignored, unless the
+        certification was made again after it was revoked. See
+        [this](https://github.com/gpg/gnupg/blob/master/doc/DETAILS#field-11---signature-class)
+        for the meaning of signature classes.
+
+        :param records: The records of the listing, each split on colons
+        :return: The graph of the certifications in the listing
+        """
+        certifications: Dict[Tuple[str, str], int] = {}
+        revocations: Dict[Tuple[str, str], int] = {}
+        names: Dict[str, str] = {}
+        emails: Dict[str, str] = {}
+        key_id: Optional[str] = None
+        in_subkey = False
+
+        for record in records:
+            if record[0] == "pub":
+                key_id, in_subkey = record[4].upper(), False
+            elif record[0] == "sub":
+                in_subkey = True
+            elif record[0] == "uid" and key_id:
+                names.setdefault(key_id, record[9])
+                email = get_uid_email(record[9])
+                if email:
+                    emails.setdefault(email.lower(), key_id)
+            elif record[0] in ("sig", "rev") and key_id and not in_subkey and len(record) > 10:
+                signer, signature_class = record[4].upper(), record[10][:2]
+                created_at = int(record[5]) if record[5].isdigit() else 0
+                if signer == key_id:
+                    continue
+
+                if record[0] == "sig" and signature_class in CERTIFICATION_CLASSES:
+                    certifications[(signer, key_id)] = max(created_at, certifications.get((signer, key_id), 0))
+                elif record[0] == "rev" and signature_class == CERTIFICATION_REVOCATION_CLASS:
+                    revocations[(signer, key_id)] = max(created_at, revocations.get((signer, key_id), 0))
+
+        adjacency: Dict[str, List[str]] = {}
+        for (signer, certified), certified_at in sorted(certifications.items()):
+            if (signer, certified) not in revocations or certified_at > revocations[(signer, certified)]:
+                adjacency.setdefault(signer, []).append(certified)
+
+        return SignatureGraph(certifications=adjacency, names=names, emails=emails)
+
+    @staticmethod
+    def from_dict(data: Dict) -> "SignatureGraph":
+        """Create a SignatureGraph from a dict made by `to_dict`.
+
+        :param data: The dict representation of the graph
+        :return: The graph
+        """
+        return SignatureGraph(certifications=data["certifications"], names=data["names"], emails=data["emails"])
+
+    def to_dict(self) -> Dict:
+        """Make a dict representation of the graph, which can be serialized to JSON.
+
+        :return: The dict representation of the graph
+        """
+        return {"certifications": self.certifications, "names": self.names, "emails": self.emails}
+
+    def resolve(self, identifier: str) -> Optional[str]:
+        """Find the long key ID of a key in the graph.
+
+        :param identifier: A fingerprint, a long or short key ID, or the email of the key's owner
+        :return: The long key ID, or None if no key in the graph matches the identifier
+        """
+        if "@" in identifier:
+            return self.emails.get(identifier.lower())
+
+        identifier = identifier.upper()[-16:]
+        key_ids = set(self.names) | set(self.certifications)
+        if identifier in key_ids:
+            return identifier
+
+        return next((key_id for key_id in sorted(key_ids) if key_id.endswith(identifier)), None)
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Find the shortest chain of certifications from a key to another, with a breadth-first search.
+
+        :param source: The long ID of the key from which the chain starts (e.g. a root key)
+        :param target: The long ID of the key at which the chain ends
+        :return: The key IDs in the chain, from source to target, or None if the target cannot be reached
+        """
+        parents: Dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+        while queue:
+            key_id = queue.popleft()
+            if key_id == target:
+                path = []
+                current: Optional[str] = key_id
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                return path[::-1]
+
+            for certified in self.certifications.get(key_id, []):
+                if certified not in parents:
+                    parents[certified] = key_id
+                    queue.append(certified)
+
+        return None
+
+    def reachable(self, source: str, max_depth: Optional[int] = None) -> Dict[str, int]:
+        """Find all the keys that can be reached from a key through chains of certifications.
+
+        :param source: The long ID of the key from which the chains start
+        :param max_depth: The maximum length of the chains, or None for no limit
+        :return: A mapping of the reachable key IDs to the length of the shortest chain reaching them
+        """
+        depths = {source: 0}
+        queue = deque([source])
+        while queue:
+            key_id = queue.popleft()
+            if max_depth is not None and depths[key_id] >= max_depth:
+                continue
+
+            for certified in self.certifications.get(key_id, []):
+                if certified not in depths:
+                    depths[certified] = depths[key_id] + 1
+                    queue.append(certified)
+
+        del depths[source]
+        return depths
+
+
+def get_uid_email(uid: str) -> Optional[str]:
+    """Get the email in a user ID, such as `Name <email>` or a bare email.
+
+    :param uid: The user ID
+    :return: The email, or None if the user ID has no email
+    """
+    if "<" in uid and uid.endswith(">"):
+        return uid.rsplit("<", 1)[1][:-1]
+
+    return uid if "@" in uid else None
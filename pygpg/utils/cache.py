@@ -0,0 +1,114 @@
+"""Utilities to cache data derived from a keyring until the keyring changes."""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from pygpg.utils.files import atomic_write
+
+if TYPE_CHECKING:
+    import gnupg
+
+CACHE_VERSION = 2
+KEYRING_FILES = ("pubring.kbx", "pubring.gpg")
+
+
+def get_gpg_home(gpg_home: Optional[str]) -> Path:
+    """Get the GPG home directory that GPG uses for a `--homedir` value.
+
+    :param gpg_home: The GPG home directory given to GPG, if any
+    :return: The path of the GPG home directory, following the same defaults as GPG
+    """
+    return Path(gpg_home or os.environ.get("GNUPGHOME") or "~/.gnupg").expanduser().resolve()
+
+
+def get_keyring_files(gpg_home: Optional[str], keyrings: Optional[List[str]] = None) -> List[Path]:
+    """Get the files in which GPG stores public keys.
+
+    This does not need a GPG interface, so that it can be used without the gnupg library.
+
+    :param gpg_home: The GPG home directory given to GPG, if any
+    :param keyrings: The keyring files given to GPG, if any
+    :return: The paths of the keyring files
+    """
+    home_path = get_gpg_home(gpg_home)
+    if keyrings:
+        # Like GPG, keyring names without a slash are relative to the GPG home
+        return [Path(keyring) if "/" in keyring else home_path / keyring for keyring in keyrings]
+
+    return [home_path / keyring_file for keyring_file in KEYRING_FILES]
+
+
+def get_gpg_keyring_files(gpg: "gnupg.GPG") -> List[Path]:
+    """Get the files in which the public keys used by a GPG interface are stored.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :return: The paths of the keyring files
+    """
+    return get_keyring_files(gpg.gnupghome, gpg.keyring)
+
+
+def get_keyring_mtime(keyring_files: List[Path]) -> int:
+    """Get the last time the keys in a keyring were changed.
+
+    :param keyring_files: The paths of the keyring files
+    :return: The latest modification time of the keyring files, in nanoseconds (0 if there are none)
+    """
+    mtimes = [keyring.stat().st_mtime_ns for keyring in keyring_files if keyring.is_file()]
+    return max(mtimes, default=0)
+
+
+def get_cache_file(keyring_files: List[Path], name: str) -> Path:
+    """Get the path of a cache file for a keyring.
+
+    :param keyring_files: The paths of the keyring files
+    :param name: The name of the cache file
+    :return: The path of the cache file, under `$XDG_CACHE_HOME/pygpg` (or `~/.cache/pygpg`)
+    """
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser()
+    keyrings = "\0".join(str(keyring) for keyring in keyring_files)
+    return cache_home / "pygpg" / hashlib.sha256(keyrings.encode("utf-8")).hexdigest()[:16] / name
+
+
+def load_cache(gpg: "gnupg.GPG", name: str) -> Optional[Dict]:
+    """Load cached data for a GPG home, if the keyring did not change since it was saved.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param name: The name of the cache file
+    :return: The cached data, or None if there is no valid cached data
+    """
+    keyring_files = get_gpg_keyring_files(gpg)
+    try:
+        with open(get_cache_file(keyring_files, name), "r", encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+
+    if cache.get("keyring_mtime") != get_keyring_mtime(keyring_files):
+        return None
+
+    return cache.get("data")
+
+
+def save_cache(gpg: "gnupg.GPG", name: str, data: Dict, keyring_mtime: int):
+    """Save data derived from a keyring to a cache file, along with the keyring's modification time.
+
+    Failing to write the cache is not an error, the data will simply be computed again next time.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param name: The name of the cache file
+    :param data: The data to cache, which must be serializable to JSON
+    :param keyring_mtime: The modification time of the keyring read before computing the data
+    """
+    cache_file = get_cache_file(get_gpg_keyring_files(gpg), name)
+    cache = {"version": CACHE_VERSION, "keyring_mtime": keyring_mtime, "data": data}
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with atomic_write(cache_file, 0o600) as file:
+            file.write(json.dumps(cache, separators=(",", ":")).encode("utf-8"))
+    except OSError:
+        pass
@@ -0,0 +1,105 @@
+"""Utilities for the shell completion of key IDs, fingerprints and emails."""
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+from click.shell_completion import CompletionItem
+
+from pygpg.utils.cache import get_cache_file, get_gpg_keyring_files, get_keyring_files, get_keyring_mtime
+from pygpg.utils.files import atomic_write
+
+if TYPE_CHECKING:
+    import gnupg
+
+COMPLETION_INDEX = "completion-index.tsv"
+KEY_ID = "id"
+FINGERPRINT = "fingerprint"
+EMAIL = "email"
+
+
+def update_completion_index(gpg: "gnupg.GPG"):
+    """Rebuild the completion index of a keyring, if the keyring changed since it was built.
+
+    The first line of the index is the modification time of the keyring when it was built, and
+    each following line is a tab separated candidate: its value, its kind, whether the key has a
+    secret part, and a description. Failing to write the index only disables completion.
+
+    :param gpg: The GPG interface used by the gnupg library
+    """
+    keyring_files = get_gpg_keyring_files(gpg)
+    index_file = get_cache_file(keyring_files, COMPLETION_INDEX)
+    keyring_mtime = get_keyring_mtime(keyring_files)
+    try:
+        with open(index_file, "r", encoding="utf-8") as index:
+            if index.readline().strip() == str(keyring_mtime):
+                return
+    except OSError:
+        pass
+
+    secret_fingerprints = {key["fingerprint"] for key in gpg.list_keys(True)}
+    lines = [str(keyring_mtime)]
+    for key in gpg.list_keys():
+        secret = "1" if key["fingerprint"] in secret_fingerprints else "0"
+        description = key["uids"][0] if key["uids"] else ""
+        lines.append("\t".join((key["keyid"], KEY_ID, secret, description)))
+        lines.append("\t".join((key["fingerprint"], FINGERPRINT, secret, description)))
+        for uid in key["uids"]:
+            if "<" in uid and uid.endswith(">"):
+                lines.append("\t".join((uid.rsplit("<", 1)[1][:-1], EMAIL, secret, uid)))
+
+    try:
+        index_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with atomic_write(index_file, 0o600) as file:
+            file.write(("\n".join(lines) + "\n").encode("utf-8"))
+    except OSError:
+        pass
+
+
+def read_completion_index(
+    gpg_home: Optional[str], keyring: Optional[str], prefix: str = ""
+) -> List[Tuple[str, str, bool, str]]:
+    """Read the candidates in the completion index of a keyring which start with a prefix.
+
+    :param gpg_home: The GPG home directory given to GPG, if any
+    :param keyring: The keyring file given to GPG, if any
+    :param prefix: The beginning of the candidates to read, which is matched without regard to case
+    :return: The candidates, as tuples of value, kind, secret and description
+    """
+    index_file = get_cache_file(get_keyring_files(gpg_home, [keyring] if keyring else None), COMPLETION_INDEX)
+    try:
+        with open(index_file, "r", encoding="utf-8") as index:
+            lines = index.read().splitlines()[1:]
+    except (OSError, ValueError):
+        return []  # A missing or unreadable index simply means there is nothing to complete
+
+    # Filtering on the raw lines first keeps completion fast on large keyrings
+    prefix = prefix.lower()
+    candidates = []
+    for line in lines:
+        if line[: len(prefix)].lower() == prefix:
+            value, kind, secret, description = line.split("\t", 3)
+            candidates.append((value, kind, secret == "1", description))
+
+    return candidates
+
+
+def make_key_completion(private: bool = False, kinds: Tuple[str, ...] = (KEY_ID, FINGERPRINT, EMAIL)) -> Callable:
+    """Make a shell completion function for parameters which identify keys.
+
+    Shell completion runs the CLI on every tab press, so candidates are read from the completion
+    index instead of from GPG: the completion path must not import the gnupg library or run GPG.
+
+    :param private: Whether to only complete keys that have a secret part in the keyring
+    :param kinds: The kinds of identifiers to complete
+    :return: A function to use as the `shell_complete` argument of click parameters
+    """
+
+    def complete_keys(ctx, _param, incomplete: str) -> List[CompletionItem]:
+        root_params = ctx.find_root().params
+        gpg_homes = root_params.get("gpg_home")
+        candidates = read_completion_index(gpg_homes[0] if gpg_homes else None, root_params.get("keyring"), incomplete)
+        return [
+            CompletionItem(value, help=description)
+            for value, kind, secret, description in candidates
+            if kind in kinds and (secret or not private)
+        ]
+
+    return complete_keys
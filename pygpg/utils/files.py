@@ -0,0 +1,78 @@
+"""Utilities for handling files."""
+import hashlib
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import BinaryIO, Iterator, Optional, cast
+
+SIZE_SUFFIXES = {"": 1, "K": 1024, "M": 1024 * 1024, "G": 1024 * 1024 * 1024}
+
+# The umask can only be read by changing it, which is not thread-safe, so it is read once on import
+UMASK = os.umask(0o022)
+os.umask(UMASK)
+
+
+@contextmanager
+def atomic_write(path: Path, mode: Optional[int] = None) -> Iterator[BinaryIO]:
+    """Open a file for writing in binary mode, such that it is replaced atomically.
+
+    The data is written to a temporary file in the same directory, which replaces the file at
+    the given path only once the block exits without errors. This way, readers never see a
+    partially written file, and a failure leaves any existing file untouched.
+
+    :param path: The path of the file to write
+    :param mode: The permissions of the file, which default to those of any new file (based on the umask)
+    :return: The temporary file to write the data to
+    """
+    with NamedTemporaryFile("wb", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as file:
+        temp_path = Path(file.name)
+        os.chmod(temp_path, 0o666 & ~UMASK if mode is None else mode)
+        try:
+            yield cast(BinaryIO, file)
+        except BaseException:
+            file.close()
+            temp_path.unlink()
+            raise
+
+    os.replace(temp_path, path)
+
+
+def parse_size(value: str) -> int:
+    """Parse a human readable size, such as `512K` or `16M`, into an amount of bytes.
+
+    :param value: The size, as a number optionally followed by one of the K, M or G binary suffixes
+    :return: The amount of bytes
+    """
+    value = value.strip().upper().rstrip("B").rstrip("I")
+    suffix = value[-1:] if value[-1:] in SIZE_SUFFIXES else ""
+    number = value[:-1] if suffix else value
+    if not number.isdigit():
+        raise ValueError(f"Not a valid size: {value}")
+
+    return int(number) * SIZE_SUFFIXES[suffix]
+
+
+def write_if_changed(path: Path, data: bytes, mode: Optional[int] = None) -> bool:
+    """Write data to a file atomically, unless the file already contains exactly that data.
+
+    The existing file is only read to compare content hashes when its size matches the new data.
+
+    :param path: The path of the file to write
+    :param data: The data to write
+    :param mode: The permissions of the file, see `atomic_write`
+    :return: Whether or not the file was written
+    """
+    if path.is_file() and path.stat().st_size == len(data):
+        existing_hash = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(64 * 1024), b""):
+                existing_hash.update(chunk)
+
+        if existing_hash.digest() == hashlib.sha256(data).digest():
+            return False
+
+    with atomic_write(path, mode) as file:
+        file.write(data)
+
+    return True
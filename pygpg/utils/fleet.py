@@ -0,0 +1,133 @@
+"""Utilities to run operations across many GPG home directories at once."""
+import concurrent.futures
+import glob
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Generic, List, Optional, TypeVar
+
+from pygpg.exceptions import PyGPGError
+from pygpg.utils.lock import DEFAULT_LOCK_TIMEOUT, get_home_lock
+
+if TYPE_CHECKING:
+    import gnupg
+
+T = TypeVar("T")
+
+FLEET_META_KEY = "pygpg.fleet"
+GLOB_CHARACTERS = ("*", "?", "[")
+
+
+@dataclass(frozen=True)
+class GPGSettings:
+    """Contains the options needed to create a GPG interface, except for the home directory."""
+
+    gpg_binary: Optional[str] = None
+    use_agent: bool = False
+    keyring: Optional[str] = None
+    lock_timeout: float = DEFAULT_LOCK_TIMEOUT
+
+    def make_gpg(self, gpg_home: Optional[str]) -> "gnupg.GPG":
+        """Create a GPG interface for the given home directory.
+
+        :param gpg_home: The GPG home directory to use, or None to use GPG's default
+        :return: The GPG interface used by the gnupg library
+        """
+        # The gnupg library is imported here to keep it off the shell completion path
+        import gnupg  # pylint: disable=C0415
+
+        gpg = gnupg.GPG(gpgbinary=self.gpg_binary or "gpg", gnupghome=gpg_home, keyring=self.keyring)
+
+        if self.use_agent:
+            gpg.use_agent = self.use_agent
+
+        return gpg
+
+
+@dataclass
+class HomeResult(Generic[T]):
+    """Contains the outcome of an operation that was run in a single GPG home directory."""
+
+    gpg_home: Optional[str]
+    value: Optional[T] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class Fleet:
+    """A set of GPG home directories on which operations are run concurrently."""
+
+    settings: GPGSettings
+    gpg_homes: List[Optional[str]]
+    max_workers: Optional[int] = None
+
+    @property
+    def is_multi_home(self) -> bool:
+        """Whether or not this fleet spans more than one GPG home directory."""
+        return len(self.gpg_homes) > 1
+
+    def run(self, func: Callable[..., T], *args: Any) -> List[HomeResult[T]]:
+        """Run a function in every GPG home directory of the fleet.
+
+        The function receives the GPG interface for a home directory as its first argument,
+        followed by `args`. When there are many home directories, the calls are spread over
+        a pool of processes, so the function and its arguments must be picklable (i.e. the
+        function must be defined at the top level of a module). The function must only read
+        from the keyring, because it runs while sharing the lock on the GPG home.
+
+        :param func: The function to run in each GPG home directory
+        :param args: Extra arguments to pass to the function
+        :return: The results, in the same order as the fleet's home directories
+        """
+        if not self.is_multi_home:
+            return [run_in_home(self.settings, gpg_home, func, args) for gpg_home in self.gpg_homes]
+
+        max_workers = min(self.max_workers or os.cpu_count() or 1, len(self.gpg_homes))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run_in_home, self.settings, gpg_home, func, args) for gpg_home in self.gpg_homes]
+            return [future.result() for future in futures]
+
+
+def run_in_home(settings: GPGSettings, gpg_home: Optional[str], func: Callable[..., T], args: tuple) -> HomeResult[T]:
+    """Run a function with a GPG interface for the given home directory.
+
+    Errors are captured as strings because they have to be sent back from worker processes.
+
+    :param settings: The settings used to create the GPG interface
+    :param gpg_home: The GPG home directory in which to run the function
+    :param func: The function to run, which takes the GPG interface as its first argument
+    :param args: Extra arguments to pass to the function
+    :return: The value returned by the function, or the error it raised
+    """
+    try:
+        with get_home_lock(gpg_home, settings.lock_timeout).shared():
+            return HomeResult(gpg_home=gpg_home, value=func(settings.make_gpg(gpg_home), *args))
+    except (OSError, PyGPGError, ValueError, RuntimeError) as ex:
+        return HomeResult(gpg_home=gpg_home, error=str(ex))
+
+
+def resolve_gpg_homes(value: str) -> List[str]:
+    """Resolve the value given for the GPG home into a list of GPG home directories.
+
+    The value can be a single directory, a glob pattern matching many directories, or
+    a file which lists one directory (or glob pattern) per line. Empty lines and lines
+    starting with `#` are ignored in such a file.
+
+    :param value: The value that was provided by the user
+    :return: The sorted list of GPG home directories, without duplicates
+    """
+    path = Path(value)
+    if path.is_file():
+        with open(path, "r", encoding="utf-8") as file:
+            patterns = [line.strip() for line in file if line.strip() and not line.strip().startswith("#")]
+    else:
+        patterns = [value]
+
+    gpg_homes: List[str] = []
+    for pattern in patterns:
+        if any(char in pattern for char in GLOB_CHARACTERS):
+            gpg_homes.extend(match for match in glob.glob(os.path.expanduser(pattern)) if Path(match).is_dir())
+        elif Path(pattern).expanduser().is_dir():
+            gpg_homes.append(str(Path(pattern).expanduser()))
+
+    return sorted(set(gpg_homes))
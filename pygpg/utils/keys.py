@@ -1,13 +1,19 @@
 """Utilities for handling GPG keys."""
-from typing import List
-
-import gnupg
+from typing import TYPE_CHECKING, Dict, Iterable, List
 
+from pygpg.enums.key_capability import KeyCapability
 from pygpg.enums.key_token import KeyToken
+from pygpg.enums.trust_value import TrustValue
+from pygpg.exceptions import RecipientError
 from pygpg.gpg_key import GPGKey
 
+if TYPE_CHECKING:
+    import gnupg
+
+UNUSABLE_KEY_VALIDITIES = {TrustValue.EXPIRED, TrustValue.REVOKED, TrustValue.INVALID}
+
 
-def get_public_keys(gpg: gnupg.GPG) -> List[GPGKey]:
+def get_public_keys(gpg: "gnupg.GPG") -> List[GPGKey]:
     """Get a list of public keys in the keyring.
 
     :param gpg: The GPG interface used by the gnupg library
@@ -18,7 +24,7 @@ def get_public_keys(gpg: gnupg.GPG) -> List[GPGKey]:
     return [GPGKey.from_gpg_key_dict(key) for key in public_keys]
 
 
-def get_private_keys(gpg: gnupg.GPG) -> List[GPGKey]:
+def get_private_keys(gpg: "gnupg.GPG") -> List[GPGKey]:
     """Get a list of private keys in the keyring.
 
     :param gpg: The GPG interface used by the gnupg library
@@ -29,7 +35,7 @@ def get_private_keys(gpg: gnupg.GPG) -> List[GPGKey]:
     return [GPGKey.from_gpg_key_dict(key) for key in private_keys]
 
 
-def get_full_private_keys(gpg: gnupg.GPG) -> List[GPGKey]:
+def get_full_private_keys(gpg: "gnupg.GPG") -> List[GPGKey]:
     """Get a list of private keys with a full private part.
 
     GPG supports exporting only the subkeys for a given key, and in this case
@@ -42,3 +48,70 @@ def get_full_private_keys(gpg: gnupg.GPG) -> List[GPGKey]:
     """
 
     return [key for key in get_private_keys(gpg) if key.key_token == KeyToken.FULL]
+
+
+def find_encryption_keys(keys: Iterable[GPGKey], email: str) -> List[GPGKey]:
+    """Find the keys of an email's owner that can be used to encrypt data.
+
+    :param keys: The keys in which to search
+    :param email: The email of the key owner, which is matched without regard to case
+    :return: The usable keys of the owner, with the most recently created keys first
+    """
+    email = email.lower()
+    matching_keys = [
+        key
+        for key in keys
+        if email in (owner_email.lower() for owner_email in key.key_owner.emails)
+        and KeyCapability.ENCRYPT in key.key_capabilities
+        and key.key_validity not in UNUSABLE_KEY_VALIDITIES
+    ]
+
+    return sorted(matching_keys, key=lambda key: key.creation_date, reverse=True)
+
+
+def resolve_recipients(gpg: "gnupg.GPG", recipients: Iterable[str]) -> List[str]:
+    """Resolve recipients into the fingerprints of the keys to encrypt data for.
+
+    Recipients that look like emails are looked up in the keyring listing, and the most
+    recently created usable key of the owner is selected. Other recipients are considered
+    to be key IDs or fingerprints and are returned unchanged.
+
+    :param gpg: The GPG interface used by the gnupg library
+    :param recipients: The emails, key IDs or fingerprints of the recipients
+    :return: The key IDs or fingerprints to give to GPG, in the same order as the recipients
+    """
+    public_keys: List[GPGKey] = []
+    resolved = []
+    for recipient in recipients:
+        if "@" not in recipient:
+            resolved.append(recipient)
+            continue
+
+        if not public_keys:
+            public_keys = get_public_keys(gpg)
+
+        encryption_keys = find_encryption_keys(public_keys, recipient)
+        if not encryption_keys:
+            raise RecipientError(recipient)
+
+        resolved.append(encryption_keys[0].key_fingerprint or encryption_keys[0].key_id)
+
+    return resolved
+
+
+def build_key_index(keys: Iterable[GPGKey]) -> Dict[str, GPGKey]:
+    """Build an index to find primary keys from the ID or fingerprint of any of their keys.
+
+    Subkeys are indexed as well, so that a signature made by a subkey can be attributed to its primary key.
+
+    :param keys: The primary keys to index
+    :return: A mapping of key IDs and fingerprints (in upper case) to their primary key
+    """
+    index: Dict[str, GPGKey] = {}
+    for key in keys:
+        for indexed_key in [key, *key.subkeys]:
+            index[indexed_key.key_id.upper()] = key
+            if indexed_key.key_fingerprint:
+                index[indexed_key.key_fingerprint.upper()] = key
+
+    return index
@@ -0,0 +1,243 @@
+"""Utilities to coordinate pygpg processes which use the same GPG home."""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional
+
+from pygpg.exceptions import LockTimeoutError
+from pygpg.utils.cache import get_gpg_home
+
+try:
+    import fcntl
+except ImportError:  # Advisory locks are not available on Windows, so only threads are coordinated there
+    fcntl = None  # type: ignore
+
+LOCK_META_KEY = "pygpg.lock"
+LOCK_FILE_NAME = ".pygpg.lock"
+DEFAULT_LOCK_TIMEOUT = 60.0
+MAX_POLL_INTERVAL = 0.1
+
+HOME_LOCK_STATES: Dict[Path, "HomeLockState"] = {}
+
+
+class HomeLock:
+    """An advisory lock on a GPG home, to coordinate the pygpg processes and threads which use it.
+
+    Operations which only read the keyring share the lock, and operations which change
+    the keyring hold it exclusively, so that they run one at a time instead of contending
+    for GPG's own keyring locks. The lock can be acquired again while it is held, in which
+    case an exclusive hold stays exclusive.
+
+    Each `HomeLock` has its own timeout and wait time, while the state of the lock is shared
+    by all the `HomeLock` objects of a GPG home in the process (see `HomeLockState`).
+    """
+
+    def __init__(self, state: "HomeLockState", timeout: float = DEFAULT_LOCK_TIMEOUT):
+        self.state = state
+        self.timeout = timeout
+        self.wait_time = 0.0
+
+    @property
+    def path(self) -> Path:
+        """The path of the lock file."""
+        return self.state.path
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """Hold the lock along with other readers of the keyring."""
+        with self._hold(exclusive=False):
+            yield
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the lock on its own, to change the keyring."""
+        with self._hold(exclusive=True):
+            yield
+
+    @contextmanager
+    def _hold(self, exclusive: bool) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            self.state.enter(exclusive, self.timeout)
+        finally:
+            self.wait_time += time.perf_counter() - start
+
+        try:
+            yield
+        finally:
+            self.state.exit()
+
+
+class HomeLockState:  # pylint: disable=R0902
+    """The state of the lock on a GPG home, shared by all the threads of a process.
+
+    Threads coordinate with a readers-writer lock, and the process holds the lock file in the
+    mode required by its threads: shared while threads are reading, and exclusive from the time
+    a thread starts writing until no thread holds the lock anymore. Each thread keeps its own
+    stack of modes, so that nested holds acquire the lock again instead of waiting for themselves.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._threads = threading.local()
+        self._file_lock = threading.Lock()
+        self._file: Optional[IO[bytes]] = None
+        self._file_mode: Optional[int] = None
+
+    def enter(self, exclusive: bool, timeout: float):
+        """Acquire the lock for the current thread, or wait until the timeout expires.
+
+        :param exclusive: Whether to hold the lock on its own, instead of along with other readers
+        :param timeout: The maximum time to wait for the lock, in seconds
+        """
+        deadline = time.perf_counter() + timeout
+        modes = self._get_modes()
+        exclusive = exclusive or (bool(modes) and modes[-1])
+        if not modes:
+            self._acquire(exclusive, timeout, deadline)
+        elif exclusive and not modes[-1]:
+            self._upgrade(timeout, deadline)
+
+        modes.append(exclusive)
+
+    def exit(self):
+        """Release the last hold of the lock by the current thread."""
+        modes = self._get_modes()
+        exclusive = modes.pop()
+        if not modes:
+            self._release(exclusive)
+        elif exclusive and not modes[-1]:
+            self._downgrade()
+
+    def _get_modes(self) -> List[bool]:
+        """Get the modes in which the current thread holds the lock, from the outermost hold to the innermost one."""
+        if not hasattr(self._threads, "modes"):
+            self._threads.modes = []
+
+        return self._threads.modes
+
+    def _acquire(self, exclusive: bool, timeout: float, deadline: float):
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: not self._writing and not (exclusive and self._readers), deadline - time.perf_counter()
+            ):
+                raise LockTimeoutError(str(self.path.parent), timeout)
+
+            if exclusive:
+                self._writing = True
+            else:
+                self._readers += 1
+
+        try:
+            self._lock_file(exclusive, timeout, deadline)
+        except LockTimeoutError:
+            self._release(exclusive)
+            raise
+
+    def _upgrade(self, timeout: float, deadline: float):
+        with self._condition:
+            self._readers -= 1
+            if not self._condition.wait_for(
+                lambda: not self._writing and not self._readers, deadline - time.perf_counter()
+            ):
+                # The thread still holds the lock in shared mode, which only waits for the current writer
+                self._condition.wait_for(lambda: not self._writing)
+                self._readers += 1
+                raise LockTimeoutError(str(self.path.parent), timeout)
+
+            self._writing = True
+
+        try:
+            self._lock_file(True, timeout, deadline)
+        except LockTimeoutError:
+            self._downgrade()
+            raise
+
+    def _downgrade(self):
+        # The lock file stays exclusive, because converting an advisory lock releases it first
+        with self._condition:
+            self._writing = False
+            self._readers += 1
+            self._condition.notify_all()
+
+    def _release(self, exclusive: bool):
+        with self._condition:
+            if exclusive:
+                self._writing = False
+            else:
+                self._readers -= 1
+
+            if not self._writing and not self._readers:
+                self._unlock_file()
+            self._condition.notify_all()
+
+    def _lock_file(self, exclusive: bool, timeout: float, deadline: float):
+        """Wait until the lock file is locked in the mode required by a thread, or until the timeout expires.
+
+        When the lock file cannot be opened (e.g. the GPG home is read-only), it is not locked.
+
+        :param exclusive: Whether to lock the file exclusively
+        :param timeout: The maximum time to wait for the lock, in seconds
+        :param deadline: The time at which the timeout expires, from `time.perf_counter`
+        """
+        if fcntl is None:
+            return
+
+        mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        with self._file_lock:
+            if self._file_mode in (mode, fcntl.LOCK_EX):
+                return
+
+            if self._file is None:
+                try:
+                    self._file = open(self.path, "ab")  # pylint: disable=R1732
+                except OSError:
+                    return
+
+            delay = 0.001
+            while True:
+                try:
+                    fcntl.flock(self._file, mode | fcntl.LOCK_NB)
+                    self._file_mode = mode
+                    return
+                except BlockingIOError:
+                    self._file_mode = None  # A failed conversion may have released the lock
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise LockTimeoutError(str(self.path.parent), timeout) from None
+
+                    time.sleep(min(delay, remaining))
+                    delay = min(delay * 2, MAX_POLL_INTERVAL)
+
+    def _unlock_file(self):
+        with self._file_lock:
+            if self._file is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+                self._file.close()
+                self._file = None
+                self._file_mode = None
+
+
+def get_home_lock(gpg_home: Optional[str], timeout: float = DEFAULT_LOCK_TIMEOUT) -> HomeLock:
+    """Get a lock on a GPG home.
+
+    All the locks on a GPG home in a process share the same state, so that nested operations
+    acquire the lock again instead of waiting for themselves, and so that threads wait for
+    each other.
+
+    :param gpg_home: The GPG home directory given to GPG, if any
+    :param timeout: The maximum time to wait for the lock, in seconds
+    :return: The lock on the GPG home
+    """
+    path = get_gpg_home(gpg_home) / LOCK_FILE_NAME
+    return HomeLock(HOME_LOCK_STATES.setdefault(path, HomeLockState(path)), timeout)
+
+
+if hasattr(os, "register_at_fork"):
+    # Child processes must not share (and release) the locks held by their parent
+    os.register_at_fork(after_in_child=HOME_LOCK_STATES.clear)
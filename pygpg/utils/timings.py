@@ -0,0 +1,60 @@
+"""Utilities to measure and report how long operations take."""
+import time
+from typing import Optional
+
+import click
+
+TIMINGS_META_KEY = "pygpg.timings"
+SIZE_UNITS = ["B", "KiB", "MiB", "GiB", "TiB"]
+
+
+class Timer:
+    """A context manager which measures the time spent in its block."""
+
+    def __init__(self) -> None:
+        self.start: Optional[float] = None
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc_info):
+        if self.start is not None:
+            self.elapsed = time.perf_counter() - self.start
+
+
+def format_size(num_bytes: float) -> str:
+    """Format an amount of bytes in a human readable way.
+
+    :param num_bytes: The amount of bytes to format
+    :return: The formatted amount, using binary units (e.g. "1.5 MiB")
+    """
+    for unit in SIZE_UNITS[:-1]:
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{int(num_bytes)} {unit}"
+        num_bytes /= 1024
+
+    return f"{num_bytes:.1f} {SIZE_UNITS[-1]}"
+
+
+def report_throughput(operation: str, num_bytes: int, elapsed: float):
+    """Display the throughput of an operation on stderr.
+
+    :param operation: The name of the operation that was measured
+    :param num_bytes: The amount of bytes processed by the operation
+    :param elapsed: The time spent in the operation, in seconds
+    """
+    rate = num_bytes / elapsed if elapsed > 0 else 0
+    click.secho(
+        f"{operation}: {format_size(num_bytes)} in {elapsed:.3f}s ({format_size(rate)}/s)", fg="bright_black", err=True
+    )
+
+
+def report_duration(operation: str, elapsed: float):
+    """Display how long an operation took on stderr.
+
+    :param operation: The name of the operation that was measured
+    :param elapsed: The time spent in the operation, in seconds
+    """
+    click.secho(f"{operation}: {elapsed * 1000:.1f}ms", fg="bright_black", err=True)